@@ -1,43 +1,14 @@
 import sys
 from pathlib import Path
-import pandas as pd
-import math
+
+import cube
+import gis
+from pipeline import load_cleaned
 
 INPUT_FILENAME = 'sp4n-lapor_2021-2024.xlsx'
-SHEET_NAME = 'Sheet1'
 OUTPUT_CSV = 'data_gis_kecamatan_improved.csv'
 OUTPUT_PNG = 'peta_sebaran_laporan_kecamatan_improved.png'
-TOP_N = 40
-
-# Minimal coordinates dictionary for known kecamatan. You can extend this.
-coords = {
-    'baleendah': (-6.9996, 107.6216),
-    'margahayu': (-6.9717, 107.5847),
-    'cileunyi': (-6.9400, 107.7300),
-    'soreang': (-7.0252, 107.5259),
-    'bojongsoang': (-6.9892, 107.6444),
-    'banjaran': (-7.0450, 107.5900),
-    'majalaya': (-7.0349, 107.7533),
-    'margaasih': (-6.9480, 107.5400),
-    'cangkuang': (-7.0700, 107.5500),
-    'rancaekek': (-6.9600, 107.7700),
-    'cicalengka': (-6.9875, 107.8401),
-    'kutawaringin': (-6.9992, 107.5066),
-    'ciparay': (-7.0350, 107.6500),
-    'arjasari': (-7.0800, 107.6300),
-    'katapang': (-7.0000, 107.5600),
-    'ciwidey': (-7.0990, 107.4337),
-    'cimenyan': (-6.8787, 107.6646),
-    'cilengkrang': (-6.9050, 107.6941),
-    'paseh': (-7.0313, 107.7905),
-    'solokan jeruk': (-7.0100, 107.7300)
-}
-
-
-def normalize(s):
-    if pd.isna(s):
-        return ''
-    return str(s).strip().casefold()
+TOP_N = gis.TOP_N
 
 
 def resolve_paths():
@@ -56,27 +27,24 @@ def aggregate(df):
         if c not in df.columns:
             raise KeyError(f"Kolom tidak ditemukan: {c}")
 
-    df = df[cols].copy()
     # Filter to Bandung if possible
     mask = df['kota_kabupaten'].astype(str).str.contains('bandung', case=False, na=False)
     if mask.sum() > 0:
         df = df[mask]
 
-    agg = df['kecamatan_final'].value_counts().reset_index()
-    agg.columns = ['kecamatan', 'count']
-    agg = agg.head(TOP_N).copy()
-    agg['kecamatan_norm'] = agg['kecamatan'].apply(normalize)
-
-    # map coordinates
-    agg['lat'] = agg['kecamatan_norm'].map(lambda k: coords.get(k, (None, None))[0])
-    agg['lon'] = agg['kecamatan_norm'].map(lambda k: coords.get(k, (None, None))[1])
-
-    return agg
+    # Same aggregation as the dashboard map (gis.py), over the Bandung rows only
+    return gis.aggregate_cube(cube.build_cube(df), TOP_N)
 
 
 def make_interactive_map(df_agg, out_html):
-    # Interactive map generation removed — only CSV and static PNG are produced.
-    raise NotImplementedError('Interactive map removed in this variant. Use static map or integrate into app.py')
+    # Same folium map as Tab 3 of app.py
+    html = gis.render_map(df_agg)
+    if html is None:
+        print('No valid coordinates for interactive map.')
+        return False
+    Path(out_html).write_text(html, encoding='utf-8')
+    print(f'Interactive map saved to: {out_html}')
+    return True
 
 
 def make_static_map(df_agg, out_png):
@@ -144,9 +112,10 @@ def main():
         print(f'Input file tidak ditemukan: {input_path}', file=sys.stderr)
         sys.exit(1)
 
-    print(f'Reading: {input_path} (sheet: {SHEET_NAME})')
+    print(f'Reading: {input_path}')
     try:
-        df = pd.read_excel(input_path, sheet_name=SHEET_NAME, engine='openpyxl')
+        # Same cleaned snapshot as app.py; the workbook is only parsed when it changed.
+        df = load_cleaned(input_path).rename(columns={'Kecamatan': 'kecamatan_final'})
     except Exception as e:
         print('Gagal membaca file Excel:', e, file=sys.stderr)
         sys.exit(1)
@@ -0,0 +1,258 @@
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+import cube
+import forecast
+import gis
+import ingest
+import pipeline
+import scoring
+import search
+import snapshot
+import status_store
+import synthetic
+from filter_index import FilterIndex, intersect
+
+# Benchmark per tahap pipeline dashboard atas data sintetis (synthetic.py).
+# Setiap tahap diukur waktunya (terbaik dari --repeat kali) dan puncak memorinya
+# (tracemalloc, putaran terpisah supaya tidak memperlambat pengukuran waktu).
+# Hasil dibandingkan dengan baseline JSON; keluar dengan kode 1 jika ada tahap
+# yang melewati toleransi atau belum punya baseline. Setiap perubahan yang
+# menambah/mengubah tahap harus menyertakan baseline baru (--save-baseline).
+BASELINE_FILE = Path(__file__).resolve().parent / 'benchmark_baseline.json'
+
+TOLERANCE = 0.25        # relatif terhadap baseline
+MIN_SECONDS = 0.05      # selisih waktu di bawah ini dianggap noise
+MIN_MB = 2.0            # selisih memori di bawah ini dianggap noise
+
+TODAY = pd.Timestamp('2024-06-15 10:30')
+UPDATES = 200
+QUERIES = ['jalan rusak', 'sampah', '"saluran tersumbat"', 'bantuan sosial lambat']
+
+
+# --- TAHAP ---
+def stage_snapshot(ctx):
+    data_path = Path(ctx['tmp']) / 'frame.parquet'
+    snapshot.write_snapshot(ctx['frame'], data_path)
+    ctx['loaded'] = snapshot.read_snapshot(data_path)
+    return len(ctx['loaded'])
+
+
+def stage_scoring(ctx):
+    compiled = scoring.compile_keywords(scoring.load_keywords())
+    scoring.score_texts(ctx['raw']['isi_laporan_awal'], compiled)
+    return len(ctx['raw'])
+
+
+def stage_clean(ctx):
+    ctx['frame'] = pipeline.clean_frame(ctx['raw'])
+    return len(ctx['frame'])
+
+
+def stage_dedup(ctx):
+    ctx['frame'] = pipeline.finish_frame(ctx['frame'])
+    return len(ctx['frame'])
+
+
+def stage_increment(ctx):
+    # Export baru berisi 1% laporan: hanya baris itu yang diklasifikasi & di-dedup
+    k = max(1, len(ctx['frame']) // 100)
+    fresh = pipeline.clean_frame(ctx['raw'].iloc[-k:])
+    df = ingest.merge_latest(ctx['frame'].iloc[:-k], fresh)
+    return len(pipeline.finish_frame(df, len(df) - len(fresh)))
+
+
+def stage_sla(ctx):
+    ctx['df'] = pipeline.apply_sla(ctx['frame'], today=TODAY)
+    return len(ctx['df'])
+
+
+def stage_cube(ctx):
+    ctx['cube'] = cube.build_cube(ctx['frame'])
+    return len(ctx['cube'])
+
+
+def stage_filter_index(ctx):
+    ctx['fidx'] = FilterIndex(ctx['frame'])
+    return ctx['fidx'].n_rows
+
+
+def stage_tab1(ctx):
+    # KPI & grafik Tab 1 untuk satu tahun, seperti di app.py
+    c = cube.slice_cube(ctx['cube'], Tahun=2023)
+    cube.total(c)
+    cube.total(cube.slice_cube(c, Status_Clean='Selesai'))
+    cube.top_value(c, 'Kategori_Clean', exclude=['Tidak Diketahui'])
+    cube.trend(c)
+    rows = ctx['fidx'].equal('Tahun', 2023)
+    overdue = len(intersect(rows, ctx['fidx'].overdue(TODAY)))
+    return len(rows) + overdue
+
+
+def stage_update(ctx):
+    # update_laporan: catat ke jurnal lalu tempelkan ke frame
+    db = Path(ctx['tmp']) / 'status.sqlite3'
+    ids = ctx['frame']['Tracking ID'].iloc[::max(1, len(ctx['frame']) // UPDATES)].head(UPDATES)
+    for tid in ids: status_store.record_update(tid, 'benchmark', db_path=db)
+    pending = status_store.pending_updates(db)
+    status_store.apply_updates(ctx['frame'], pending)
+    return len(pending)
+
+
+def stage_gis(ctx):
+    return len(gis.aggregate_cube(ctx['cube'], Tahun=2023))
+
+
+def stage_forecast(ctx):
+    return len(forecast.forecast(ctx['cube']))
+
+
+def stage_search(ctx):
+    # Bangun index teks lalu jawab beberapa query kata kunci & frasa
+    idx = search.SearchIndex(ctx['frame'])
+    for q in QUERIES: idx.search(q, rows=ctx['fidx'].equal('Tahun', 2023))
+    return idx.n_rows
+
+
+STAGES = [
+    ('clean', stage_clean),
+    ('scoring', stage_scoring),
+    ('dedup', stage_dedup),
+    ('increment', stage_increment),
+    ('snapshot', stage_snapshot),
+    ('sla', stage_sla),
+    ('cube', stage_cube),
+    ('filter_index', stage_filter_index),
+    ('tab1', stage_tab1),
+    ('update', stage_update),
+    ('gis', stage_gis),
+    ('forecast', stage_forecast),
+    ('search', stage_search),
+]
+
+# Tahap yang hasilnya (ctx) dibutuhkan tahap lain; dijalankan tanpa diukur
+# jika tidak dipilih lewat --stages.
+REQUIRES = {
+    'dedup': ['clean'],
+    'increment': ['clean', 'dedup'],
+    'snapshot': ['clean', 'dedup'],
+    'sla': ['clean', 'dedup'],
+    'cube': ['clean', 'dedup'],
+    'filter_index': ['clean', 'dedup'],
+    'tab1': ['clean', 'dedup', 'cube', 'filter_index'],
+    'update': ['clean', 'dedup'],
+    'gis': ['clean', 'dedup', 'cube'],
+    'forecast': ['clean', 'dedup', 'cube'],
+    'search': ['clean', 'dedup', 'filter_index'],
+}
+
+
+# --- PENGUKURAN ---
+def measure(fn, ctx, repeat=1, memory=True):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = fn(ctx)
+        best = min(best, time.perf_counter() - start)
+    result = {'seconds': round(best, 4), 'rows': int(rows)}
+    if memory:
+        tracemalloc.start()
+        try:
+            fn(ctx)
+            result['peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run(size, repeat=1, memory=True, stages=None, seed=0):
+    n = synthetic.parse_size(size)
+    ctx = {'raw': synthetic.generate(n, seed)}
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        ctx['tmp'] = tmp
+        needed = set(stages or []) | {r for s in stages or [] for r in REQUIRES.get(s, [])}
+        for name, fn in STAGES:
+            if stages and name not in stages:
+                if name in needed: fn(ctx)
+                continue
+            results[name] = measure(fn, ctx, repeat, memory)
+            print(f"  {size:>5} {name:<13} {results[name]['seconds']:>9.3f}s"
+                  + (f" {results[name]['peak_mb']:>9.1f} MB" if memory else ''))
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Daftar pesan regresi (kosong jika semua tahap masih dalam toleransi).
+
+    Tahap tanpa baseline ikut dilaporkan, bukan dianggap lolos.
+    """
+    problems = []
+    for size, stages in results.items():
+        for name, now in stages.items():
+            base = baseline.get(size, {}).get(name)
+            if not base:
+                problems.append(f"{size}/{name}: belum ada baseline (jalankan dengan --save-baseline)")
+                continue
+            for key, floor, unit in [('seconds', MIN_SECONDS, 's'), ('peak_mb', MIN_MB, ' MB')]:
+                if key not in now or key not in base: continue
+                limit = base[key] * (1 + tolerance)
+                if now[key] > limit and now[key] - base[key] > floor:
+                    problems.append(f"{size}/{name}: {key} {now[key]}{unit} > {base[key]}{unit} (+{tolerance:.0%})")
+    return problems
+
+
+def load_baseline(path=BASELINE_FILE):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baseline(results, path=BASELINE_FILE):
+    baseline = load_baseline(path)
+    # Per tahap: menyimpan hasil --stages tidak menghapus baseline tahap lain
+    for size, stages in results.items(): baseline.setdefault(size, {}).update(stages)
+    baseline['_meta'] = {'python': platform.python_version(), 'pandas': pd.__version__, 'machine': platform.machine()}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark tahap pipeline dashboard SP4N LAPOR.')
+    parser.add_argument('--sizes', nargs='+', default=['10k', '100k'], help=f"ukuran data ({', '.join(synthetic.SIZES)} atau angka)")
+    parser.add_argument('--stages', nargs='+', choices=[name for name, _ in STAGES], help='hanya tahap ini')
+    parser.add_argument('--repeat', type=int, default=3, help='ulangi pengukuran waktu, ambil yang terbaik')
+    parser.add_argument('--no-memory', action='store_true', help='lewati pengukuran tracemalloc')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE)
+    parser.add_argument('--baseline', type=Path, default=BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true', help='simpan hasil sebagai baseline baru')
+    args = parser.parse_args(argv)
+
+    results = {size: run(size, args.repeat, not args.no_memory, args.stages) for size in args.sizes}
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f'Baseline disimpan ke {args.baseline}')
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if not baseline:
+        print(f'Baseline {args.baseline} belum ada; jalankan dengan --save-baseline.')
+        return 0
+    problems = compare(results, baseline, args.tolerance)
+    for p in problems: print('REGRESI', p, file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,42 @@
+import plotly.express as px
+
+import cube
+
+# KPI & grafik Tab 1, dipakai bersama oleh app.py dan report.py (tanpa
+# Streamlit). Semua dihitung dari cube, jadi pemanggil cukup memberi slice.
+NOISE_KATEGORI = ["Tidak Diketahui", "Lainnya"]
+IGNORE_INSTANSI = ["Umum", "Tidak Diketahui", "Nan", "nan"]
+
+
+def kpis(data_cube, overdue):
+    """Total laporan, overdue, % selesai dan isu terbanyak untuk satu slice cube."""
+    total_laporan = cube.total(data_cube)
+    selesai = cube.total(cube.slice_cube(data_cube, Status_Clean='Selesai'))
+    return {
+        'total': total_laporan,
+        'overdue': int(overdue),
+        'persen_selesai': (selesai / total_laporan * 100) if total_laporan > 0 else 0,
+        'top_isu': cube.top_value(data_cube, 'Kategori_Clean', exclude=NOISE_KATEGORI) or "-",
+    }
+
+
+def trend_figure(data_cube):
+    trend = cube.trend(data_cube)
+    return px.line(trend, x='Bulan', y='Jumlah', markers=True, template='plotly_white', height=350)
+
+
+def instansi_pie(data_cube):
+    pie_df = cube.top_n(data_cube, 'Instansi_Clean', 5, exclude=IGNORE_INSTANSI)
+    pie_df.columns = ['Instansi', 'Jumlah']
+    fig = px.pie(pie_df, values='Jumlah', names='Instansi', hole=0.4, height=350)
+    fig.update_traces(textinfo='value')
+    fig.update_layout(showlegend=False, margin=dict(t=0, b=0, l=0, r=0))
+    return fig
+
+
+def kategori_bar(data_cube):
+    top_cat_df = cube.top_n(data_cube, 'Kategori_Clean', 10, exclude=NOISE_KATEGORI)
+    top_cat_df.columns = ['Kategori', 'Jumlah']
+    fig = px.bar(top_cat_df, x='Jumlah', y='Kategori', orientation='h', text='Jumlah', color='Jumlah', color_continuous_scale='Blues')
+    fig.update_layout(yaxis={'categoryorder': 'total ascending'}, height=400)
+    return fig
@@ -0,0 +1,61 @@
+import pandas as pd
+
+# Cube hitungan laporan per kombinasi dimensi. Dibangun sekali saat data
+# dimuat; KPI, grafik dan persiapan prompt AI cukup me-roll-up sel cube
+# (ratusan baris) alih-alih memindai ulang seluruh frame.
+DIMENSIONS = ['Tahun', 'Bulan', 'Kategori_Clean', 'Kecamatan_Clean', 'Instansi_Clean', 'Status_Clean']
+
+
+def build_cube(df):
+    # Insiden: jumlah laporan pertama tiap insiden (dedup.py) di sel ini, jadi
+    # tetap bisa dijumlahkan lintas sel tanpa menghitung satu insiden dua kali.
+    # Dikelompokkan langsung per Series dimensi: frame tidak disalin.
+    utama = df['Insiden_Utama'] if 'Insiden_Utama' in df.columns else pd.Series(True, index=df.index)
+    return (
+        utama.astype('int64')
+        .groupby([df[dim] for dim in DIMENSIONS], observed=True, dropna=False, sort=False)
+        .agg(Jumlah='size', Insiden='sum')
+        .reset_index()
+    )
+
+
+def by_incident(cube):
+    """Cube yang menghitung insiden unik; semua fungsi di bawah tetap bisa dipakai."""
+    return cube.assign(Jumlah=cube['Insiden'])
+
+
+def slice_cube(cube, **filters):
+    """Ambil sel yang cocok, mis. slice_cube(c, Tahun=2023, Kecamatan_Clean=['Soreang'])."""
+    mask = pd.Series(True, index=cube.index)
+    for dim, value in filters.items():
+        if isinstance(value, (list, tuple, set)):
+            mask &= cube[dim].isin(list(value))
+        else:
+            mask &= cube[dim] == value
+    return cube[mask]
+
+
+def total(cube):
+    return int(cube['Jumlah'].sum())
+
+
+def rollup(cube, by):
+    """Jumlahkan cube ke dimensi `by`, urut dari yang terbanyak (seri, urut nama)."""
+    out = cube.groupby(by, observed=True)['Jumlah'].sum().reset_index()
+    out = out[out['Jumlah'] > 0]
+    return out.sort_values(['Jumlah', by], ascending=[False, True], kind='stable').reset_index(drop=True)
+
+
+def top_n(cube, by, n, exclude=()):
+    if exclude: cube = cube[~cube[by].isin(list(exclude))]
+    return rollup(cube, by).head(n)
+
+
+def top_value(cube, by, exclude=()):
+    """Setara .mode()[0] pada frame mentah; None jika cube kosong."""
+    top = top_n(cube, by, 1, exclude)
+    return None if top.empty else top[by].iloc[0]
+
+
+def trend(cube):
+    return cube.groupby('Bulan')['Jumlah'].sum().reset_index()
@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+
+# Pengelompokan laporan hampir-sama (satu kejadian dilaporkan berkali-kali
+# atau oleh banyak warga). Teks divektorkan dengan TF-IDF ter-hash, lalu
+# di-LSH dengan random hyperplane: laporan yang sekecamatan dan jatuh ke
+# ember yang sama di salah satu band hanya dibandingkan dengan tetangga
+# terdekatnya menurut tanggal, jadi biayanya linear, bukan kuadratik.
+# Pasangan yang lolos cek kemiripan kosinus & jarak waktu digabung dengan
+# connected components; Insiden_ID = Tracking ID laporan pertama insiden itu.
+# Saat export baru ditambahkan, extend_incident_ids() hanya menghitung ulang
+# laporan baru, laporan lama di sekitarnya, dan insiden yang mereka sentuh.
+TEXT_COLUMN = 'Isi Laporan Awal'
+
+N_FEATURES = 2 ** 16
+N_BANDS = 8
+BAND_BITS = 8
+SIMILARITY = 0.8      # kemiripan kosinus minimum
+WINDOW_DAYS = 30      # jarak maksimum antar laporan yang berurutan dalam satu insiden
+SEED = 0
+CHUNK = 50_000
+NAT_DAY = -(1 << 30)  # hari pengganti untuk tanggal kosong di nearby_rows
+TOKEN_PATTERN = r'(?u)\b[a-z0-9]{2,}\b'
+
+
+def vectorize(texts):
+    """TF-IDF ter-hash (unigram + bigram), baris dinormalisasi L2."""
+    from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+
+    hashed = HashingVectorizer(
+        n_features=N_FEATURES, token_pattern=TOKEN_PATTERN, ngram_range=(1, 2),
+        alternate_sign=False, norm=None, dtype=np.float32
+    ).transform(texts)
+    return TfidfTransformer(sublinear_tf=True).fit_transform(hashed).astype(np.float32)
+
+
+def signatures(vectors, seed=SEED):
+    """Kode band (n_teks x N_BANDS) dari tanda proyeksi ke hyperplane acak."""
+    rng = np.random.default_rng(seed)
+    planes = rng.standard_normal((vectors.shape[1], N_BANDS * BAND_BITS), dtype=np.float32)
+    bits = np.asarray(vectors @ planes) > 0
+    weights = 1 << np.arange(BAND_BITS)
+    return bits.reshape(len(bits), N_BANDS, BAND_BITS) @ weights
+
+
+def candidate_pairs(group, codes, days):
+    """Pasangan (a, b) baris bertetangga (urut tanggal) dalam ember yang sama di tiap band."""
+    pairs = []
+    for band in range(codes.shape[1]):
+        key = group.astype(np.int64) * (1 << BAND_BITS) + codes[:, band]
+        order = np.lexsort((days, key))
+        same = key[order[1:]] == key[order[:-1]]
+        pairs.append(np.column_stack([order[:-1][same], order[1:][same]]))
+    pairs = np.concatenate(pairs)
+    # Pasangan yang sama dari beberapa band cukup dicek sekali
+    n = len(group)
+    flat = np.unique(pairs[:, 0].astype(np.int64) * n + pairs[:, 1])
+    return np.column_stack([flat // n, flat % n])
+
+
+def cosine(vectors, a, b, chunk=CHUNK):
+    """Kosinus per pasangan baris (vektor sudah L2), dihitung per potongan agar memori terbatas."""
+    out = np.empty(len(a), dtype=np.float32)
+    for i in range(0, len(a), chunk):
+        s = slice(i, i + chunk)
+        out[s] = np.asarray(vectors[a[s]].multiply(vectors[b[s]]).sum(axis=1)).ravel()
+    return out
+
+
+def incident_ids(df, similarity=SIMILARITY, window_days=WINDOW_DAYS):
+    """Insiden_ID per baris: Tracking ID laporan paling awal dalam kelompoknya."""
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    n = len(df)
+    ids = df['Tracking ID'].astype(str).to_numpy()
+    if n < 2: return ids
+
+    # Teks yang sama cukup divektorkan sekali
+    text_code, uniques = pd.factorize(df[TEXT_COLUMN].fillna('').astype(str))
+    vectors = vectorize(uniques)
+    codes = signatures(vectors)[text_code]
+
+    group = pd.factorize(df['Kecamatan_Clean'])[0]
+    days = df['Tanggal_Parsed'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+    days = np.where(df['Tanggal_Parsed'].isna().to_numpy(), np.iinfo(np.int64).min // 2, days)
+
+    pairs = candidate_pairs(group, codes, days)
+    a, b = pairs[:, 0], pairs[:, 1]
+    keep = np.abs(days[a] - days[b]) <= window_days
+    a, b = a[keep], b[keep]
+    # Kemiripan dihitung per pasangan teks unik, bukan per pasangan laporan
+    m = len(uniques)
+    text_pair, inverse = np.unique(text_code[a].astype(np.int64) * m + text_code[b], return_inverse=True)
+    ta, tb = text_pair // m, text_pair % m
+    sim = np.ones(len(text_pair), dtype=np.float32)
+    differ = ta != tb
+    if differ.any(): sim[differ] = cosine(vectors, ta[differ], tb[differ])
+    sim = sim[inverse]
+    a, b = a[sim >= similarity], b[sim >= similarity]
+
+    graph = coo_matrix((np.ones(len(a), dtype=np.int8), (a, b)), shape=(n, n))
+    _, label = connected_components(graph, directed=False)
+
+    # Wakil insiden: laporan paling awal (lalu posisi baris paling kecil)
+    order = np.lexsort((np.arange(n), days, label))
+    _, head = np.unique(label[order], return_index=True)
+    return ids[order[head]][label]
+
+
+def nearby_rows(df, new, window_days=WINDOW_DAYS):
+    """Posisi baris lama (bukan `new`) yang sekecamatan & berjarak <= window_days dari salah satu baris baru."""
+    days = df['Tanggal_Parsed'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+    days = np.where(df['Tanggal_Parsed'].isna().to_numpy(), NAT_DAY, days)
+    key = pd.factorize(df['Kecamatan_Clean'])[0].astype(np.int64) * (1 << 40) + days
+    new_key = np.sort(key[new])
+    old = np.flatnonzero(~new)
+    old_key = key[old]
+    pos = np.searchsorted(new_key, old_key)
+    left = np.abs(old_key - new_key[np.maximum(pos - 1, 0)])
+    right = np.abs(new_key[np.minimum(pos, len(new_key) - 1)] - old_key)
+    return old[np.minimum(left, right) <= window_days]
+
+
+def extend_incident_ids(df, similarity=SIMILARITY, window_days=WINDOW_DAYS):
+    """Lengkapi Insiden_ID yang masih kosong (laporan baru) di frame yang sudah di-dedup.
+
+    Baris lama hanya bisa tergabung dengan laporan baru jika sekecamatan dan
+    dekat tanggalnya, jadi cukup laporan baru + seluruh anggota insiden lama
+    yang tersentuh yang dihitung ulang; insiden lain dibawa apa adanya.
+    Laporan lama yang muncul lagi di export baru membawa Insiden_ID-nya
+    (ingest.merge_latest): isi awal, tanggal & kecamatannya tidak berubah.
+    """
+    ids = df['Insiden_ID'].astype(object).to_numpy(copy=True)
+    new = pd.isna(ids)
+    if not new.any(): return ids
+    touched = pd.unique(ids[nearby_rows(df, new, window_days)])
+    sub = np.flatnonzero(new | pd.Series(ids).isin(touched).to_numpy())
+    ids[sub] = incident_ids(df.iloc[sub], similarity, window_days)
+    return ids
@@ -0,0 +1,113 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+import scoring
+
+# Inverted index untuk filter dashboard: setiap nilai di kolom yang di-index
+# menyimpan array posisi baris yang terurut. Filter gabungan menjadi operasi
+# irisan/gabungan array (AND/OR) tanpa memindai dan menyalin seluruh frame.
+INDEXED_COLUMNS = ['Tahun', 'Kategori_Clean', 'Kecamatan_Clean', 'Status_Clean', 'Label_Kata', 'Insiden_Utama']
+
+EMPTY = np.array([], dtype=np.int64)
+
+
+def _postings(values):
+    codes, uniques = pd.factorize(values)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    return {u: order[bounds[i]:bounds[i + 1]] for i, u in enumerate(uniques.tolist())}
+
+
+def _as_list(values):
+    if isinstance(values, (list, tuple, set, np.ndarray, pd.Index)):
+        return list(values)
+    return [values]
+
+
+def intersect(a, b):
+    """AND dua himpunan baris; None berarti 'semua baris'."""
+    if a is None: return b
+    if b is None: return a
+    return np.intersect1d(a, b, assume_unique=True)
+
+
+def take(df, rows):
+    return df if rows is None else df.iloc[rows]
+
+
+class FilterIndex:
+    def __init__(self, df, columns=INDEXED_COLUMNS):
+        self.n_rows = len(df)
+        df = df.assign(Label_Kata=scoring.finalize(df['Skor_Kata'], df['Jumlah_Negatif'], False)[1])
+        self.postings = {col: _postings(df[col]) for col in columns}
+
+        # Status per baris saat ini; perubahan dari jurnal dipindahkan lewat sync()
+        self._status = df['Status_Clean'].astype(object).to_numpy(copy=True)
+        self._lock = threading.Lock()
+
+        # Target_Selesai terurut: Sisa_Hari < 0 <=> Target_Selesai < sekarang,
+        # jadi predikat waktu cukup dijawab dengan searchsorted.
+        target = df['Target_Selesai'].to_numpy()
+        valid = np.flatnonzero(~np.isnat(target))
+        self._target_order = valid[np.argsort(target[valid], kind='stable')]
+        self._target_sorted = target[self._target_order]
+
+    def sync(self, updates, id_index):
+        """Pindahkan baris yang statusnya diubah lewat jurnal ke posting status barunya."""
+        if updates.empty: return
+        positions = id_index.get_indexer_for(updates.index)
+        found = positions >= 0
+        status = updates['status'].reindex(id_index[positions[found]]).to_numpy(dtype=object)
+        positions = positions[found]
+        with self._lock:
+            changed = self._status[positions] != status
+            if not changed.any(): return
+            positions, status = positions[changed], status[changed]
+            post = dict(self.postings['Status_Clean'])
+            for old in set(self._status[positions].tolist()):
+                if old in post: post[old] = np.setdiff1d(post[old], positions, assume_unique=True)
+            for new in set(status.tolist()):
+                post[new] = np.union1d(post.get(new, EMPTY), positions[status == new])
+            self._status[positions] = status
+            # Ganti dict sekaligus: sesi lain tetap membaca posting yang utuh
+            self.postings['Status_Clean'] = post
+
+    def equal(self, col, values):
+        """OR atas beberapa nilai dalam satu kolom."""
+        post = self.postings[col]
+        parts = [post[v] for v in _as_list(values) if v in post]
+        if not parts: return EMPTY
+        return parts[0] if len(parts) == 1 else np.sort(np.concatenate(parts))
+
+    def not_equal(self, col, values):
+        excluded = set(_as_list(values))
+        return self.equal(col, [v for v in self.postings[col] if v not in excluded])
+
+    def select(self, rows=None, **criteria):
+        """AND antar kolom; kriteria bernilai None/list kosong diabaikan."""
+        for col, values in criteria.items():
+            if values is None or (isinstance(values, (list, tuple, set)) and not values): continue
+            rows = intersect(rows, self.equal(col, values))
+        return rows
+
+    def before(self, now):
+        k = np.searchsorted(self._target_sorted, pd.Timestamp(now).to_datetime64(), side='left')
+        return np.sort(self._target_order[:k])
+
+    def at_or_after(self, now):
+        k = np.searchsorted(self._target_sorted, pd.Timestamp(now).to_datetime64(), side='left')
+        return np.sort(self._target_order[k:])
+
+    def overdue(self, now):
+        """Baris Terlambat: lewat target dan belum selesai."""
+        return np.setdiff1d(self.before(now), self.equal('Status_Clean', 'Selesai'), assume_unique=True)
+
+    def priority(self, label, now):
+        """Baris dengan Label_Prioritas tertentu pada jam `now` (termasuk bonus overdue)."""
+        static = self.equal('Label_Kata', label)
+        overdue = self.overdue(now)
+        if label == scoring.LABEL_CRITICAL:
+            return np.union1d(static, overdue)
+        return np.setdiff1d(static, overdue, assume_unique=True)
@@ -0,0 +1,121 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+# Prakiraan volume laporan bulan depan per (Kecamatan, Kategori) tanpa LLM.
+# Semua seri bulanan disusun menjadi satu matriks (seri x bulan) dari cube,
+# lalu Holt-Winters aditif dijalankan sekaligus untuk semua seri dan semua
+# kombinasi parameter di GRID; tiap seri memakai parameter dengan galat
+# satu-langkah terkecil. Interval dari simpangan baku galat tersebut.
+BY = ['Kecamatan_Clean', 'Kategori_Clean']
+SEASON = 12
+MIN_TOTAL = 12        # seri dengan total laporan lebih kecil tidak diprakirakan
+Z = 1.96              # interval ~95%
+MIN_MONTH_SHARE = 0.2  # bulan dengan total < 20% median bulanan dianggap belum lengkap
+
+# (alpha level, beta tren, gamma musiman)
+GRID = list(itertools.product([0.1, 0.3, 0.5, 0.8], [0.0, 0.1], [0.1, 0.3]))
+
+
+def series_matrix(data_cube, by=BY, min_total=MIN_TOTAL):
+    """(kunci seri, daftar bulan, matriks seri x bulan); bulan tanpa laporan = 0."""
+    cells = data_cube[data_cube['Bulan'].notna() & (data_cube['Bulan'] != 'NaT')]
+    if cells.empty: return pd.DataFrame(columns=by), [], np.zeros((0, 0))
+    counts = cells.groupby(by + ['Bulan'], observed=True)['Jumlah'].sum()
+    wide = counts.unstack('Bulan', fill_value=0)
+    months = pd.period_range(min(wide.columns), max(wide.columns), freq='M').astype(str)
+    wide = wide.reindex(columns=months, fill_value=0)
+    # Bulan-bulan terakhir yang hampir kosong (tanggal salah ketik di masa depan,
+    # atau bulan berjalan) tidak dianggap data: seri berakhir di bulan penuh terakhir
+    totals = wide.sum(axis=0).to_numpy()
+    full = np.flatnonzero(totals >= MIN_MONTH_SHARE * np.median(totals[totals > 0]))
+    wide = wide.iloc[:, :full[-1] + 1]
+    months = list(wide.columns)
+    wide = wide[wide.sum(axis=1) >= min_total]
+    return wide.index.to_frame(index=False), months, wide.to_numpy(dtype=np.float64)
+
+
+def holt_winters(Y, alpha, beta, gamma, season=SEASON):
+    """Jalankan Holt-Winters aditif atas Y (seri x bulan) untuk tiap parameter sekaligus.
+
+    alpha/beta/gamma berbentuk (G, 1); hasil (prakiraan 1 langkah, galat
+    satu-langkah) berbentuk (G, seri) dan (G, seri, bulan).
+    """
+    n_series, n_months = Y.shape
+    seasonal = n_months >= 2 * season
+    m = season if seasonal else 1
+    G = alpha.shape[0]
+
+    first = Y[:, :m].mean(axis=1)
+    level = np.broadcast_to(first, (G, n_series)).copy()
+    if seasonal:
+        trend0 = (Y[:, m:2 * m].mean(axis=1) - first) / m
+        season_idx = np.broadcast_to(Y[:, :m] - first[:, None], (G, n_series, m)).copy()
+    else:
+        trend0 = np.zeros(n_series)
+        season_idx = np.zeros((G, n_series, m))
+    trend = np.broadcast_to(trend0, (G, n_series)).copy()
+    if not seasonal: gamma = np.zeros_like(gamma)
+
+    errors = np.full((G, n_series, n_months), np.nan)
+    for t in range(m, n_months):
+        s = season_idx[:, :, t % m]
+        y = Y[:, t]
+        errors[:, :, t] = y - (level + trend + s)
+        new_level = alpha * (y - s) + (1 - alpha) * (level + trend)
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        season_idx[:, :, t % m] = gamma * (y - new_level) + (1 - gamma) * s
+        level = new_level
+    return level + trend + season_idx[:, :, n_months % m], errors
+
+
+def forecast_matrix(Y, grid=GRID):
+    """(prakiraan, batas bawah, batas atas) bulan depan untuk tiap baris Y."""
+    if Y.size == 0: return np.zeros(0), np.zeros(0), np.zeros(0)
+    alpha, beta, gamma = (np.array(p, dtype=np.float64)[:, None] for p in zip(*grid))
+    point, errors = holt_winters(Y, alpha, beta, gamma)
+
+    sse = np.nansum(errors ** 2, axis=2)
+    best = sse.argmin(axis=0)
+    cols = np.arange(Y.shape[0])
+    point = np.maximum(point[best, cols], 0)
+    n_err = np.maximum(np.isfinite(errors[best, cols]).sum(axis=1), 1)
+    sigma = np.sqrt(sse[best, cols] / n_err)
+    return point, np.maximum(point - Z * sigma, 0), point + Z * sigma
+
+
+def forecast(data_cube, by=BY, min_total=MIN_TOTAL):
+    """Tabel prakiraan bulan depan per seri, urut dari prakiraan terbesar.
+
+    Kolom: kunci `by`, Bulan (bulan yang diprakirakan), Terakhir (bulan data
+    terakhir), Prediksi, Bawah, Atas.
+    """
+    keys, months, Y = series_matrix(data_cube, by, min_total)
+    columns = list(by) + ['Bulan', 'Terakhir', 'Prediksi', 'Bawah', 'Atas']
+    if not months or len(keys) == 0: return pd.DataFrame(columns=columns)
+
+    point, lower, upper = forecast_matrix(Y)
+    out = keys.assign(
+        Bulan=str(pd.Period(months[-1], freq='M') + 1),
+        Terakhir=Y[:, -1].astype(int),
+        Prediksi=point.round(1),
+        Bawah=lower.round(1),
+        Atas=upper.round(1),
+    )
+    return out[columns].sort_values('Prediksi', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def forecast_total(data_cube):
+    """Prakiraan total seluruh laporan bulan depan (satu baris, atau None)."""
+    out = forecast(data_cube.assign(Semua='Semua'), by=['Semua'], min_total=0)
+    return None if out.empty else out.iloc[0]
+
+
+def prompt_text(per_seri, total, n=5):
+    """Ringkasan prakiraan untuk prompt AI."""
+    if total is None: return "(data bulanan belum cukup untuk prakiraan)"
+    lines = [f"Total {total['Bulan']}: {total['Prediksi']:.0f} laporan (interval {total['Bawah']:.0f}-{total['Atas']:.0f}; bulan terakhir {total['Terakhir']})"]
+    for r in per_seri.head(n).itertuples(index=False):
+        lines.append(f"- {r.Kecamatan_Clean} / {r.Kategori_Clean}: {r.Prediksi:.1f} (interval {r.Bawah:.1f}-{r.Atas:.1f}; bulan terakhir {r.Terakhir})")
+    return "\n".join(lines)
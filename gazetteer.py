@@ -0,0 +1,93 @@
+import functools
+import hashlib
+import re
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Gazetteer kecamatan: nama kanonik, alias, titik tengah dan kabupaten induk.
+# Nilai kecamatan bebas (salah eja, spasi, awalan "Kec.") dicocokkan lewat
+# index trigram, sehingga app.py dan GIS_improved.py memakai nama yang sama.
+GAZETTEER_FILE = Path(__file__).resolve().parent / 'gazetteer_kecamatan.csv'
+
+# Kemiripan Jaccard trigram minimum untuk dianggap cocok
+MIN_SIMILARITY = 0.5
+
+_PREFIX = re.compile(r'^\s*(kecamatan|kec\.?)\s+')
+
+
+def normalize_key(text):
+    if pd.isna(text): return ''
+    text = _PREFIX.sub('', str(text).casefold())
+    return re.sub(r'[^0-9a-z]', '', text)
+
+
+def trigrams(key):
+    padded = f'$${key}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class Gazetteer:
+    def __init__(self, entries):
+        self.entries = entries.reset_index(drop=True)
+        self.keys = {}
+        for i, row in self.entries.iterrows():
+            aliases = [] if pd.isna(row['alias']) else str(row['alias']).split(';')
+            for name in [row['nama']] + aliases:
+                key = normalize_key(name)
+                if key: self.keys.setdefault(key, i)
+
+        self._key_list = list(self.keys)
+        self._key_grams = [trigrams(k) for k in self._key_list]
+        self._postings = defaultdict(list)
+        for kid, grams in enumerate(self._key_grams):
+            for g in grams: self._postings[g].append(kid)
+
+    def lookup(self, text):
+        """Index baris gazetteer untuk teks kecamatan, atau -1 jika tidak ada yang mirip."""
+        key = normalize_key(text)
+        if not key: return -1
+        if key in self.keys: return self.keys[key]
+
+        grams = trigrams(key)
+        shared = Counter(kid for g in grams for kid in self._postings.get(g, ()))
+        best, best_sim = -1, 0.0
+        for kid, c in shared.items():
+            sim = c / (len(grams) + len(self._key_grams[kid]) - c)
+            if sim > best_sim: best, best_sim = kid, sim
+        if best_sim < MIN_SIMILARITY: return -1
+        return self.keys[self._key_list[best]]
+
+    def canonical(self, text):
+        i = self.lookup(text)
+        return None if i < 0 else self.entries.at[i, 'nama']
+
+    def resolve(self, values):
+        """Cocokkan sekumpulan nilai sekaligus; setiap nilai unik hanya dicari sekali."""
+        codes, uniques = pd.factorize(pd.Series(values))
+        found = np.array([self.lookup(u) for u in uniques] + [-1], dtype=np.int64)
+        rows = found[codes]  # kode -1 (NaN) jatuh ke elemen terakhir = -1
+        valid = rows >= 0
+        take = np.where(valid, rows, 0)
+        out = pd.DataFrame({
+            'nama': self.entries['nama'].to_numpy(dtype=object)[take],
+            'lat': self.entries['lat'].to_numpy(dtype=float)[take],
+            'lon': self.entries['lon'].to_numpy(dtype=float)[take],
+            'kabupaten': self.entries['kabupaten'].to_numpy(dtype=object)[take],
+        })
+        out.loc[~valid, :] = np.nan
+        return out
+
+
+@functools.lru_cache(maxsize=None)
+def load_gazetteer(path=GAZETTEER_FILE):
+    if not Path(path).exists():
+        return Gazetteer(pd.DataFrame(columns=['nama', 'alias', 'lat', 'lon', 'kabupaten']))
+    return Gazetteer(pd.read_csv(path))
+
+
+def signature(path=GAZETTEER_FILE):
+    if not Path(path).exists(): return 'none'
+    return hashlib.sha1(Path(path).read_bytes()).hexdigest()[:12]
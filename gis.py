@@ -0,0 +1,58 @@
+import hashlib
+
+import pandas as pd
+
+import cube
+from gazetteer import load_gazetteer
+
+# Agregasi peta per kecamatan, dipakai bersama oleh Tab 3 di app.py dan
+# skrip offline GIS_improved.py. Hitungan diambil dari cube (per tahun dan
+# status cukup slice_cube), koordinat dari titik tengah gazetteer.
+TOP_N = 40
+
+COLUMNS = ['kecamatan', 'count', 'kecamatan_norm', 'lat', 'lon']
+
+
+def normalize(s):
+    if pd.isna(s):
+        return ''
+    return str(s).strip().casefold()
+
+
+def from_counts(counts, top_n=TOP_N):
+    """Rollup cube per Kecamatan_Clean -> tabel peta (kecamatan, count, lat, lon)."""
+    agg = counts.head(top_n).rename(columns={'Kecamatan_Clean': 'kecamatan', 'Jumlah': 'count'})
+    agg = agg.assign(kecamatan=agg['kecamatan'].astype(str)).reset_index(drop=True)
+    agg['kecamatan_norm'] = agg['kecamatan'].map(normalize)
+    geo = load_gazetteer().resolve(agg['kecamatan'])
+    agg['lat'] = geo['lat'].to_numpy()
+    agg['lon'] = geo['lon'].to_numpy()
+    return agg[COLUMNS]
+
+
+def aggregate_cube(data_cube, top_n=TOP_N, **filters):
+    """Mis. aggregate_cube(c, Tahun=2023, Status_Clean='Selesai'); filter None diabaikan."""
+    filters = {k: v for k, v in filters.items() if v is not None}
+    if filters: data_cube = cube.slice_cube(data_cube, **filters)
+    return from_counts(cube.rollup(data_cube, 'Kecamatan_Clean'), top_n)
+
+
+def aggregate_key(agg):
+    """Hash isi agregat; peta yang sama cukup dirender sekali."""
+    return hashlib.sha1(pd.util.hash_pandas_object(agg, index=False).to_numpy().tobytes()).hexdigest()
+
+
+def render_map(agg, height=500):
+    """HTML folium untuk agregat; baris tanpa koordinat dilewati. None jika tidak ada titik."""
+    import folium
+
+    valid = agg.dropna(subset=['lat', 'lon'])
+    if valid.empty: return None
+    m = folium.Map(location=[valid['lat'].mean(), valid['lon'].mean()], zoom_start=10, tiles='CartoDB positron')
+    radius = 5 + valid['count'] / valid['count'].max() * 20
+    for name, count, lat, lon, r in zip(valid['kecamatan'], valid['count'], valid['lat'], valid['lon'], radius):
+        folium.CircleMarker(
+            [lat, lon], radius=r, color='#2a9d8f', fill=True,
+            popup=folium.Popup(f"<b>{name}</b><br>Jumlah: {count}", max_width=200)
+        ).add_to(m)
+    return m.get_root().render()
@@ -0,0 +1,68 @@
+import base64
+import functools
+import hashlib
+import io
+from pathlib import Path
+
+# Registry ikon: setiap PNG dibaca & di-encode base64 sekali per proses,
+# lalu dikirim sekali sebagai kelas CSS. Widget cukup merujuk nama kelasnya
+# alih-alih menyisipkan data base64 berkilo-kilobyte di setiap render.
+# Stylesheet hanya memuat ikon yang didaftarkan halaman (ICON_* di app.py).
+
+# Ikon tampil paling besar 30px; simpan 2x untuk layar retina.
+ICON_PX = 64
+# Ikon datar cukup dengan palet 64 warna (alpha tetap dipertahankan)
+ICON_COLORS = 64
+
+
+def _shrink(data):
+    try:
+        from PIL import Image
+    except ImportError:
+        return data
+    with Image.open(io.BytesIO(data)) as img:
+        if max(img.size) <= ICON_PX: return data
+        img = img.convert('RGBA')
+        img.thumbnail((ICON_PX, ICON_PX))
+        img = img.quantize(ICON_COLORS, method=Image.Quantize.FASTOCTREE)
+        out = io.BytesIO()
+        img.save(out, format='PNG', optimize=True)
+    return out.getvalue() if out.tell() < len(data) else data
+
+
+@functools.lru_cache(maxsize=None)
+def load_icon(path):
+    """(nama kelas, data base64) untuk file ikon, atau None jika tidak ada."""
+    path = Path(path)
+    if not path.is_absolute(): path = Path(__file__).resolve().parent / path
+    if not path.exists(): return None
+    data = path.read_bytes()
+    digest = hashlib.sha1(data).hexdigest()[:10]
+    return f"ico-{digest}", base64.b64encode(_shrink(data)).decode()
+
+
+# Kelas yang sudah ada di stylesheet yang dikirim
+_in_sheet = set()
+
+
+@functools.lru_cache(maxsize=None)
+def stylesheet(paths):
+    """Blok <style> berisi satu kelas per ikon di `paths`; cukup dirender sekali per halaman."""
+    rules = [".ico{display:inline-block;background-size:contain;background-repeat:no-repeat;background-position:center;}"]
+    for path in dict.fromkeys(paths):
+        icon = load_icon(path)
+        if icon is None: continue
+        cls, data = icon
+        _in_sheet.add(cls)
+        rules.append(f".{cls}{{background-image:url(data:image/png;base64,{data});}}")
+    return "<style>" + "\n".join(rules) + "</style>"
+
+
+def icon_span(path, size, style=""):
+    icon = load_icon(path)
+    if icon is None: return ""
+    cls, data = icon
+    if cls not in _in_sheet:
+        # Ikon yang tidak didaftarkan ke stylesheet disisipkan langsung
+        style += f" background-image:url(data:image/png;base64,{data});"
+    return f'<span class="ico {cls}" style="width:{size}px; height:{size}px; {style}"></span>'
@@ -0,0 +1,252 @@
+import os
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+import snapshot
+
+# Ingest satu folder berisi export LAPOR! (xlsx/csv). Setiap file dibaca &
+# dinormalisasi sekali (snapshot per file, dikunci sidik jarinya), lalu semua
+# laporan digabung dengan aturan "status terbaru menang" per Tracking ID:
+# file diurutkan dari yang paling lama diubah, baris dari file yang lebih baru
+# menimpa yang lama. Export baru cukup menambahkan barisnya ke dataset gabungan
+# yang sudah di-cache; file lama tidak diproses ulang.
+DATA_DIR = os.environ.get('LAPOR_DATA_DIR', 'data')
+PATTERNS = ('*.xlsx', '*.csv')
+
+# Naikkan jika normalisasi per file berubah
+INGEST_VERSION = 1
+
+# Header export mentah LAPOR! -> nama kolom seperti sp4n-lapor_2021-2024.xlsx
+COLUMN_ALIASES = {
+    'tracking id': 'tracking_id',
+    'tanggal laporan masuk': 'tanggal_masuk',
+    'waktu laporan masuk': 'waktu_masuk',
+    'klasifikasi laporan': 'klasifikasi',
+    'id kategori': 'id_kategori',
+    'kategori': 'kategori',
+    'judul laporan': 'judul',
+    'isi laporan awal': 'isi_laporan_awal',
+    'isi laporan akhir': 'isi_laporan_akhir',
+    'sumber laporan': 'sumber_laporan',
+    'instansi induk': 'instansi_induk',
+    'instansi terdisposisi': 'dinas_tujuan',
+    'status laporan': 'status',
+    'alasan tunda/arsip': 'alasan_tunda',
+    'provinsi': 'provinsi',
+    'kota/kabupaten': 'kota_kabupaten',
+    'kecamatan': 'kecamatan_final',
+    'status final': 'status_final',
+}
+
+# Export mentah tidak punya status_final; turunkan dari status laporan
+# (mengikuti mayoritas pemetaan di sp4n-lapor_2021-2024.xlsx).
+STATUS_FINAL_RULES = [
+    ('ditutup', 'Selesai'),
+    ('menunggu', 'Menunggu'),
+    ('diarsipkan oleh pelapor', 'Belum Terverifikasi'),
+    ('konten terblokir', 'Belum Terverifikasi'),
+    ('belum terverifikasi', 'Belum Terverifikasi'),
+    ('diarsipkan', 'Diproses'),
+]
+
+BULAN_ID = {
+    'januari': 'jan', 'februari': 'feb', 'maret': 'mar', 'april': 'apr', 'mei': 'may',
+    'juni': 'jun', 'juli': 'jul', 'agustus': 'aug', 'agu': 'aug', 'agt': 'aug',
+    'september': 'sep', 'oktober': 'oct', 'okt': 'oct', 'november': 'nov',
+    'desember': 'dec', 'des': 'dec',
+}
+_BULAN = re.compile(r'\b(' + '|'.join(sorted(BULAN_ID, key=len, reverse=True)) + r')\b', re.I)
+
+HEADER_SCAN_ROWS = 30
+
+
+# --- DAFTAR FILE ---
+def list_exports(data_dir=DATA_DIR):
+    """File export di folder, urut dari yang paling lama diubah (yang terakhir menang)."""
+    data_dir = Path(data_dir)
+    if not data_dir.is_dir(): return []
+    files = {p.resolve() for pattern in PATTERNS for p in data_dir.glob(pattern)
+             if not p.name.startswith(('~$', '.')) and '.tmp' not in p.suffixes}
+    return sorted(files, key=lambda p: (p.stat().st_mtime_ns, p.name))
+
+
+def source_mtime(source):
+    """Penanda perubahan sumber (file atau folder) untuk kunci cache app.py."""
+    source = Path(source)
+    if not source.is_dir(): return source.stat().st_mtime
+    files = list_exports(source)
+    return max([source.stat().st_mtime] + [f.stat().st_mtime for f in files]), len(files)
+
+
+def export_path(data_dir=DATA_DIR, prefix='status_admin'):
+    """Nama file export baru; karena paling baru, barisnya menang saat digabung."""
+    return Path(data_dir) / f"{prefix}_{datetime.now():%Y%m%d_%H%M%S}.csv"
+
+
+# --- NORMALISASI PER FILE ---
+def normalize_id(ids):
+    return ids.astype(str).str.strip().str.replace(r'\.0$', '', regex=True)
+
+
+def parse_tanggal(values):
+    if pd.api.types.is_datetime64_any_dtype(values): return values
+    text = values.astype(str).str.replace(_BULAN, lambda m: BULAN_ID[m.group(1).lower()], regex=True)
+    return pd.to_datetime(text, errors='coerce', format='mixed', dayfirst=True)
+
+
+def derive_status_final(status):
+    text = status.astype(str).str.lower()
+    out = pd.Series('Diproses', index=status.index, dtype=object)
+    done = pd.Series(False, index=status.index)
+    for needle, value in STATUS_FINAL_RULES:
+        hit = text.str.contains(needle, regex=False) & ~done
+        out[hit] = value
+        done |= hit
+    return out
+
+
+def _header_row(path):
+    head = (pd.read_excel(path, header=None, nrows=HEADER_SCAN_ROWS, engine='openpyxl')
+            if path.suffix == '.xlsx' else pd.read_csv(path, header=None, nrows=HEADER_SCAN_ROWS))
+    for i, row in enumerate(head.itertuples(index=False)):
+        cells = {str(v).strip().lower() for v in row if pd.notna(v)}
+        if cells & {'tracking id', 'tracking_id'}: return i
+    return 0
+
+
+def read_export(path):
+    """Baca satu export (boleh diawali blok judul) ke skema kolom sp4n-lapor."""
+    path = Path(path)
+    header = _header_row(path)
+    df = (pd.read_excel(path, header=header, engine='openpyxl')
+          if path.suffix == '.xlsx' else pd.read_csv(path, header=header))
+    df = df.rename(columns=lambda c: COLUMN_ALIASES.get(str(c).strip().lower(), str(c).strip()))
+    df = df.loc[:, ~df.columns.duplicated()]
+    if 'tracking_id' not in df.columns:
+        raise KeyError(f"Kolom Tracking ID tidak ditemukan di {path.name}")
+
+    df['tracking_id'] = normalize_id(df['tracking_id'])
+    df = df[~df['tracking_id'].isin(['', 'nan', 'None'])]
+    if 'tanggal_masuk' in df.columns: df['tanggal_masuk'] = parse_tanggal(df['tanggal_masuk'])
+    if 'status_final' not in df.columns and 'status' in df.columns:
+        df['status_final'] = derive_status_final(df['status'])
+
+    # Kolom teks campuran (mis. jam sebagai datetime.time) disamakan jadi str
+    # supaya bisa disimpan ke Parquet dan digabung dengan export lain.
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df.drop_duplicates('tracking_id', keep='last').reset_index(drop=True)
+
+
+def load_export(path):
+    return snapshot.load_frame(path, read_export, extra_key=f'ingest-v{INGEST_VERSION}', namespace='ingest')
+
+
+def read_exports(files):
+    """Gabungan export mentah; Tracking ID ganda diambil dari file paling akhir."""
+    parts = [load_export(f) for f in files]
+    if not parts: return pd.DataFrame(columns=['tracking_id'])
+    df = pd.concat(parts, ignore_index=True, sort=False)
+    return df.drop_duplicates('tracking_id', keep='last').reset_index(drop=True)
+
+
+def read_directory(data_dir=DATA_DIR):
+    return read_exports(list_exports(data_dir))
+
+
+# --- DATASET GABUNGAN (INKREMENTAL) ---
+def _fingerprints(files, known):
+    """Sidik jari per file; sha256 hanya dihitung ulang jika ukuran/mtime berubah."""
+    known = {k['path']: k for k in known}
+    out = []
+    for f in files:
+        stat = f.stat()
+        prev = known.get(str(f))
+        if prev and prev['size'] == stat.st_size and prev['mtime_ns'] == stat.st_mtime_ns:
+            digest = prev['sha256']
+        else:
+            digest = snapshot.file_hash(f)
+        out.append({'path': str(f), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest})
+    return out
+
+
+def _recategorize(df, like):
+    # Kolom dimensi dari build adalah Categorical; setelah concat kategorinya disatukan lagi
+    for col in like.columns:
+        if isinstance(like[col].dtype, pd.CategoricalDtype) and col in df.columns:
+            values = df[col].astype(object)
+            df[col] = pd.Categorical(values, categories=sorted(values.dropna().unique()))
+    return df
+
+
+def merge_latest(base, fresh, id_col='Tracking ID'):
+    """Baris `fresh` menggantikan baris `base` dengan Tracking ID yang sama.
+
+    Kolom yang hanya ada di `base` (hasil finish, mis. Insiden_ID) dibawa
+    dari versi lama laporan itu; laporan yang benar-benar baru berisi NaN.
+    """
+    replaced = base[id_col].isin(fresh[id_col])
+    carry = base.columns.difference(fresh.columns).tolist()
+    if carry and replaced.any():
+        fresh = fresh.merge(base.loc[replaced, [id_col] + carry], on=id_col, how='left')
+    merged = pd.concat([base[~replaced], fresh], ignore_index=True, sort=False)
+    return _recategorize(merged, base)
+
+
+def load_directory(data_dir, clean, extra_key='', finish=None):
+    """clean(raw) atas gabungan semua export; hanya file baru yang dibersihkan ulang.
+
+    finish(df, start), jika ada, dijalankan atas frame gabungan sebelum
+    snapshot ditulis (tahap lintas file, mis. dedup); baris posisi < start
+    berasal dari snapshot sebelumnya dan sudah pernah diproses finish.
+
+    File baru yang lebih muda dari semua file yang sudah di-ingest cukup
+    ditambahkan; file yang berubah, terhapus atau disisipkan di tengah urutan
+    memicu build ulang penuh.
+    """
+    data_dir = Path(data_dir).resolve()
+    files = list_exports(data_dir)
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        df = clean(read_exports(files))
+        return finish(df, 0) if finish else df
+
+    data_path, meta_path = snapshot.snapshot_paths(data_dir, 'ingest-dir')
+    meta = snapshot.read_meta(meta_path)
+    valid = bool(meta) and meta.get('extra_key') == extra_key and data_path.exists()
+    current = _fingerprints(files, meta.get('files', []) if valid else [])
+
+    base, new_files = None, files
+    if valid:
+        done = [(f['path'], f['sha256']) for f in meta['files']]
+        if [(f['path'], f['sha256']) for f in current[:len(done)]] == done:
+            new_files = files[len(done):]
+            try:
+                base = snapshot.read_snapshot(data_path)
+            except Exception as e:
+                print(f'Snapshot rusak, dibangun ulang: {e}', file=sys.stderr)
+                new_files = files
+            if base is not None and not new_files: return base
+
+    fresh = clean(read_exports(new_files))
+    df = fresh if base is None else merge_latest(base, fresh)
+    if finish: df = finish(df, len(df) - len(fresh))
+    try:
+        snapshot.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        snapshot.write_snapshot(df, data_path)
+        snapshot.write_meta(meta_path, {
+            'path': str(data_dir),
+            'files': current,
+            'extra_key': extra_key,
+            'rows': len(df),
+        })
+    except Exception as e:
+        print(f'Gagal menyimpan snapshot: {e}', file=sys.stderr)
+    return df
+
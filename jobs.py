@@ -0,0 +1,37 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Pool pekerja latar belakang bersama (satu per proses, lihat get_job_pool di
+# app.py). Pekerjaan lambat seperti AI Insight dijalankan di sini supaya
+# script run tidak ikut menunggu; job dengan key yang sama yang masih berjalan
+# digabung sehingga beberapa petugas yang menekan tombol bersamaan hanya
+# memicu satu panggilan.
+MAX_WORKERS = 4
+
+
+class JobPool:
+    def __init__(self, max_workers=MAX_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='lapor-job')
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    def submit(self, key, fn, *args, **kwargs):
+        """Future untuk job `key`; jika job yang sama masih berjalan, Future itu yang dipakai."""
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None: return future
+            future = self._executor.submit(fn, *args, **kwargs)
+            self._in_flight[key] = future
+        future.add_done_callback(lambda f: self._forget(key, f))
+        return future
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._in_flight.get(key) is future: del self._in_flight[key]
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._in_flight)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
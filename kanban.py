@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+import scoring
+
+# Antrian prioritas untuk Papan Kontrol. Urutan "paling mendesak" =
+# Target_Selesai paling awal (Sisa_Hari terkecil / paling lama telat), lalu
+# skor kata kunci tertinggi. Urutan ini tidak bergantung jam, jadi dihitung
+# sekali; jam hanya menentukan di mana batas overdue (searchsorted).
+CHUNK = 512
+
+BUCKETS = [scoring.LABEL_CRITICAL, scoring.LABEL_WARNING, scoring.LABEL_NORMAL]
+
+
+class KanbanQueues:
+    def __init__(self, df):
+        target = df['Target_Selesai'].to_numpy()
+        # NaT diletakkan paling akhir (Sisa_Hari NaN = tidak pernah overdue)
+        key_target = np.where(np.isnat(target), np.iinfo(np.int64).max, target.astype('datetime64[ns]').astype(np.int64))
+        order = np.lexsort((-df['Skor_Kata'].to_numpy(), key_target))
+        self._order = order
+        self._target = target[order]
+
+        label = np.asarray(scoring.finalize(df['Skor_Kata'], df['Jumlah_Negatif'], False)[1])
+        self.queues = {}
+        for bucket in BUCKETS:
+            q = order[label[order] == bucket]
+            self.queues[bucket] = (q, target[q])
+
+        # Penghapusan malas: laporan yang ditutup admin cukup ditandai,
+        # tidak perlu membangun ulang antrian.
+        self.open = (df['Status_Clean'] != 'Selesai').to_numpy().copy()
+
+    def sync(self, updates, id_index):
+        """Tandai laporan yang sudah ditutup lewat jurnal status."""
+        closed = updates.index[updates['status'] == 'Selesai']
+        if len(closed) == 0: return
+        pos = id_index.get_indexer_for(closed)
+        self.open[pos[pos >= 0]] = False
+
+    def _cut(self, targets, now):
+        # Posisi pertama dengan Target_Selesai >= now (= Sisa_Hari >= 0)
+        return np.searchsorted(targets, pd.Timestamp(now).to_datetime64(), side='left')
+
+    def candidates(self, bucket, now):
+        """Kandidat kolom `bucket` dalam urutan prioritas, masih perlu difilter."""
+        if bucket == scoring.LABEL_CRITICAL:
+            # Semua laporan terbuka yang overdue jadi CRITICAL dan selalu berada
+            # di depan urutan; sisanya adalah CRITICAL yang belum overdue.
+            q, t = self.queues[bucket]
+            return [self._order[:self._cut(self._target, now)], q[self._cut(t, now):]]
+        q, t = self.queues[bucket]
+        cut = self._cut(t, now)
+        return [q[cut:][~np.isnat(t[cut:])]]
+
+    def top_k(self, bucket, now, k, offset=0, allowed=None):
+        """Ambil kartu ke-offset .. offset+k yang paling mendesak; berhenti begitu cukup."""
+        keep = self.open if allowed is None else (self.open & allowed)
+        need = offset + k
+        hits = []
+        found = 0
+        for cand in self.candidates(bucket, now):
+            for start in range(0, len(cand), CHUNK):
+                chunk = cand[start:start + CHUNK]
+                chunk = chunk[keep[chunk]]
+                hits.append(chunk)
+                found += len(chunk)
+                if found >= need: break
+            if found >= need: break
+        if not hits: return np.array([], dtype=np.int64)
+        return np.concatenate(hits)[offset:need]
@@ -0,0 +1,167 @@
+import hashlib
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import scoring
+
+# Klasifikasi kategori & prioritas dari isi laporan. Model dilatih offline
+# (`python klasifikasi.py train`) dari riwayat berlabel di workbook lalu
+# disimpan dengan joblib; pipeline menjalankan inferensi batch sekali per
+# build snapshot. Vektorisasi memakai HashingVectorizer (tanpa kosakata yang
+# perlu dilatih), jadi laporan baru langsung bisa dinilai tanpa melatih ulang.
+# Tanpa file model, pipeline tetap memakai kategori asli & skor kata kunci.
+MODEL_FILE = Path(__file__).resolve().parent / 'klasifikasi_model.joblib'
+MODEL_VERSION = 1
+
+N_FEATURES = 2 ** 18
+TOKEN_PATTERN = r'(?u)\b[a-z0-9]{2,}\b'
+
+# Kategori yang dianggap belum berlabel: diisi dari prediksi model
+UNKNOWN_KATEGORI = {"Tidak Diketahui", "Topik Lainnya", "Lainnya"}
+MIN_CLASS_SIZE = 5    # kategori dengan contoh lebih sedikit tidak dipelajari
+MIN_PROBA = 0.5       # prediksi kategori di bawah keyakinan ini diabaikan
+
+# Label prioritas model -> skor dasar minimum (ambang di scoring.finalize)
+PRIORITY_SCORE = {scoring.LABEL_CRITICAL: 50, scoring.LABEL_WARNING: 20, scoring.LABEL_NORMAL: 0}
+
+
+def vectorizer():
+    from sklearn.feature_extraction.text import HashingVectorizer
+
+    return HashingVectorizer(
+        n_features=N_FEATURES, token_pattern=TOKEN_PATTERN, ngram_range=(1, 2),
+        alternate_sign=False, norm='l2', dtype=np.float32
+    )
+
+
+def _classifier():
+    from sklearn.linear_model import SGDClassifier
+
+    # elasticnet -> banyak bobot nol, sehingga coef_ bisa disimpan sparse
+    return SGDClassifier(loss='log_loss', penalty='elasticnet', alpha=1e-5, l1_ratio=0.15,
+                         class_weight='balanced', max_iter=100, tol=1e-4, random_state=0)
+
+
+# --- PELATIHAN ---
+def training_labels(df):
+    """(teks, label kategori, label prioritas) dari frame bersih pipeline.
+
+    Prioritas belum pernah dilabeli manual, jadi dipakai label kata kunci
+    sebagai label lemah; model lalu menangkap laporan serupa tanpa kata kunci.
+    """
+    text = df['Isi Laporan Awal'].fillna('').astype(str)
+    kategori = df['Kategori_Clean'].astype(str)
+    counts = kategori.value_counts()
+    known = ~kategori.isin(UNKNOWN_KATEGORI) & kategori.map(counts).ge(MIN_CLASS_SIZE)
+    prioritas = pd.Series(scoring.finalize(df['Skor_Kata'], df['Jumlah_Negatif'], False)[1], index=df.index)
+    return text, kategori.where(known), prioritas
+
+
+def train(df, test_size=0.2):
+    """Latih kedua model; kembalikan (model, akurasi holdout per target)."""
+    from sklearn.model_selection import train_test_split
+
+    text, kategori, prioritas = training_labels(df)
+    X = vectorizer().transform(text)
+    model = {'version': MODEL_VERSION, 'trained_at': datetime.now().isoformat(timespec='seconds'), 'n_rows': len(df)}
+    scores = {}
+    for name, y in [('kategori', kategori), ('prioritas', prioritas)]:
+        rows = np.flatnonzero(y.notna().to_numpy())
+        y = y.to_numpy()[rows]
+        stratify = y if pd.Series(y).value_counts().min() >= 2 else None
+        tr, te = train_test_split(rows, test_size=test_size, random_state=0, stratify=stratify)
+        clf = _classifier().fit(X[tr], y[np.searchsorted(rows, tr)])
+        scores[name] = float(clf.score(X[te], y[np.searchsorted(rows, te)]))
+        # Model akhir dilatih ulang dengan semua baris berlabel
+        model[name] = _classifier().fit(X[rows], y).sparsify()
+    return model, scores
+
+
+def save_model(model, path=MODEL_FILE):
+    import joblib
+
+    tmp = Path(path).with_suffix('.tmp')
+    joblib.dump(model, tmp, compress=3)
+    tmp.replace(path)
+
+
+def load_model(path=MODEL_FILE):
+    """Model tersimpan, atau None jika belum dilatih / versinya tidak cocok."""
+    if not Path(path).exists(): return None
+    import joblib
+
+    model = joblib.load(path)
+    return model if model.get('version') == MODEL_VERSION else None
+
+
+def signature(path=MODEL_FILE):
+    """Hash file model (ikut kunci snapshot); 'none' jika belum ada."""
+    if not Path(path).exists(): return 'none'
+    return hashlib.sha1(Path(path).read_bytes()).hexdigest()[:12]
+
+
+# --- INFERENSI BATCH ---
+def predict(texts, model):
+    """(kategori, keyakinan kategori, label prioritas) untuk seluruh kolom teks sekaligus.
+
+    Teks yang sama (laporan duplikat) hanya divektorkan & dinilai sekali.
+    """
+    codes, uniques = pd.factorize(pd.Series(texts).fillna('').astype(str))
+    X = vectorizer().transform(uniques)
+    proba = model['kategori'].predict_proba(X)
+    kategori = model['kategori'].classes_[proba.argmax(axis=1)]
+    prioritas = model['prioritas'].predict(X)
+    return kategori[codes], proba.max(axis=1)[codes], prioritas[codes]
+
+
+def apply_model(df, model, start=0):
+    """Isi kategori yang belum diketahui & naikkan Skor_Kata sesuai prioritas model.
+
+    Prioritas akhir = yang lebih tinggi antara kata kunci dan model, jadi
+    laporan kritis yang terdeteksi kata kunci tidak pernah turun. Baris
+    sebelum `start` sudah dinilai di build sebelumnya dan tidak disentuh.
+    """
+    kategori, proba, prioritas = predict(df['Isi Laporan Awal'].iloc[start:], model)
+
+    fill = df['Kategori_Clean'].iloc[start:].isin(UNKNOWN_KATEGORI).to_numpy() & (proba >= MIN_PROBA)
+    kat = df['Kategori_Clean'].astype(object).to_numpy(copy=True)
+    # Penanda lama tetap berlaku selama kategorinya masih hasil prediksi yang sama
+    # (model dijalankan ulang atas frame yang sudah diisi); label asli menghapusnya.
+    flag = df['Kategori_Prediksi'].eq(True).to_numpy(copy=True) if 'Kategori_Prediksi' in df.columns else np.zeros(len(df), dtype=bool)
+    flag[start:] = fill | (flag[start:] & (kat[start:] == kategori))
+    kat[start:][fill] = kategori[fill]
+    df['Kategori_Clean'] = pd.Categorical(kat, categories=sorted(set(kat)))
+    df['Kategori_Prediksi'] = flag
+
+    floor = pd.Series(prioritas).map(PRIORITY_SCORE).fillna(0).to_numpy()
+    skor = df['Skor_Kata'].to_numpy(copy=True)
+    skor[start:] = np.maximum(skor[start:], floor.astype(skor.dtype))
+    df['Skor_Kata'] = skor
+    return df
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] != 'train':
+        print('Pemakaian: python klasifikasi.py train [file_sumber]', file=sys.stderr)
+        sys.exit(1)
+
+    import pipeline
+
+    source = sys.argv[2] if len(sys.argv) > 2 else pipeline.get_file_path()
+    if not source:
+        print('File sumber tidak ditemukan.', file=sys.stderr)
+        sys.exit(1)
+    # Latih dari label asli, bukan dari hasil model sebelumnya
+    df = pipeline.clean_frame(pipeline.read_source(source))
+    model, scores = train(df)
+    save_model(model)
+    for name, acc in scores.items(): print(f'Akurasi holdout {name}: {acc:.1%}')
+    print(f'Model disimpan ke {MODEL_FILE}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+import hashlib
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import profiling
+
+# Backend LLM untuk AI Insight. Klien dibuat saat pertama kali dipakai (di
+# app.py lewat st.cache_resource), bukan saat import, dan jawaban disimpan di
+# SQLite berdasarkan hash prompt sehingga prompt yang sama tidak dikirim ulang.
+# Backend dipilih lewat env LAPOR_LLM_BACKEND: "gemini" (default) atau "stub"
+# (deterministik, tanpa jaringan; untuk uji coba dan deployment offline).
+BACKEND_ENV = 'LAPOR_LLM_BACKEND'
+DEFAULT_BACKEND = 'gemini'
+
+CACHE_DB = Path(__file__).resolve().parent / '.cache' / 'llm_responses.sqlite3'
+CACHE_TTL = 24 * 3600  # detik
+CACHE_MAX_ENTRIES = 256
+
+# Urutan prioritas model yang ingin kita pakai
+GEMINI_MODELS = [
+    'models/gemini-1.5-flash',
+    'models/gemini-1.5-pro',
+    'models/gemini-pro'
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key        TEXT PRIMARY KEY,
+    response   TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    used_at    REAL NOT NULL
+)
+"""
+
+
+# --- BACKEND ---
+class GeminiBackend:
+    name = 'gemini'
+
+    def __init__(self, api_key=None):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key or os.environ.get('GEMINI_API_KEY'))
+        # Cari model yang tersedia secara dinamis
+        available = [
+            m.name for m in genai.list_models()
+            if 'generateContent' in m.supported_generation_methods
+        ]
+        # Jika tidak ada yang cocok di daftar prioritas, ambil yang pertama tersedia
+        self.model_name = next((m for m in GEMINI_MODELS if m in available), None) or available[0]
+        self._model = genai.GenerativeModel(self.model_name)
+
+    def generate(self, prompt):
+        return self._model.generate_content(prompt).text
+
+
+class StubBackend:
+    """Jawaban tetap yang diturunkan dari prompt; tidak butuh jaringan maupun API key."""
+    name = 'stub'
+    model_name = 'stub'
+
+    def __init__(self, api_key=None):
+        pass
+
+    def generate(self, prompt):
+        digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:12]
+        lines = [l.strip() for l in prompt.splitlines() if l.strip()]
+        return "\n".join([
+            f"* **Prediksi Tren**: (stub {digest}) tidak ada model bahasa yang dipakai.",
+            f"* **Pola Masalah**: prompt berisi {len(lines)} baris data.",
+            "* **Rekomendasi Strategis**: set LAPOR_LLM_BACKEND=gemini untuk analisis sebenarnya.",
+        ])
+
+
+BACKENDS = {
+    'gemini': GeminiBackend,
+    'stub': StubBackend,
+}
+
+
+def create_backend(name=None, **kwargs):
+    name = (name or os.environ.get(BACKEND_ENV) or DEFAULT_BACKEND).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Backend LLM tidak dikenal: {name} (pilihan: {', '.join(BACKENDS)})")
+    return BACKENDS[name](**kwargs)
+
+
+# --- CACHE JAWABAN ---
+@contextmanager
+def connect(db_path=CACHE_DB):
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(SCHEMA)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def prompt_key(backend, prompt):
+    text = f"{backend.name}:{backend.model_name}\n{prompt}"
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def cached_response(key, ttl=CACHE_TTL, db_path=CACHE_DB):
+    """Jawaban tersimpan yang belum kedaluwarsa, atau None."""
+    now = time.time()
+    with connect(db_path) as conn:
+        row = conn.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None: return None
+        if now - row[1] > ttl:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            return None
+        conn.execute("UPDATE responses SET used_at = ? WHERE key = ?", (now, key))
+    return row[0]
+
+
+def store_response(key, response, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, db_path=CACHE_DB):
+    """Simpan jawaban lalu buang yang kedaluwarsa dan yang paling lama tidak dipakai (LRU)."""
+    now = time.time()
+    with connect(db_path) as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, response, created_at, used_at) VALUES (?, ?, ?, ?)",
+            (key, response, now, now)
+        )
+        conn.execute("DELETE FROM responses WHERE created_at < ?", (now - ttl,))
+        conn.execute(
+            "DELETE FROM responses WHERE key NOT IN (SELECT key FROM responses ORDER BY used_at DESC LIMIT ?)",
+            (max_entries,)
+        )
+
+
+def generate(backend, prompt, ttl=CACHE_TTL, db_path=CACHE_DB):
+    """Jawaban untuk prompt; backend hanya dipanggil jika belum ada di cache."""
+    key = prompt_key(backend, prompt)
+    cached = cached_response(key, ttl, db_path)
+    profiling.count('ai', cached is not None)
+    if cached is not None: return cached
+    response = backend.generate(prompt)
+    store_response(key, response, ttl, db_path=db_path)
+    return response
@@ -0,0 +1,184 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import dedup
+import gazetteer
+import ingest
+import klasifikasi
+import scoring
+import snapshot
+
+# --- KONSTANTA ---
+SLA_HARI = 5
+
+# Naikkan angka ini setiap kali logika pembersihan/scoring berubah,
+# supaya snapshot lama di .cache/ tidak dipakai lagi.
+PIPELINE_VERSION = 7
+
+# --- FUNGSI PEMBERSIHAN ---
+def clean_category_name(text):
+    if pd.isna(text) or str(text).strip() in ["-", "", "nan"]: return "Tidak Diketahui"
+    text = str(text).strip()
+    for prefix in ["Lainnya terkait ", "Permintaan Informasi ", "Pengaduan ", "Aspirasi "]:
+        text = text.replace(prefix, "")
+    return text
+
+def clean_agency_name(text):
+    if pd.isna(text): return "Umum"
+    text = str(text).lower()
+    if "pekerjaan umum" in text or "pupr" in text: return "Dinas PUTR"
+    if "lingkungan hidup" in text or "dlh" in text: return "DLH (Lingkungan Hidup)"
+    if "kependudukan" in text or "capil" in text: return "Disdukcapil"
+    if "sosial" in text or "dinsos" in text: return "Dinas Sosial"
+    if "kesehatan" in text or "dinkes" in text: return "Dinas Kesehatan"
+    if "polisi pamong" in text or "satpol" in text: return "Satpol PP"
+    if "pendidikan" in text or "disdik" in text: return "Dinas Pendidikan"
+    if "perhubungan" in text or "dishub" in text: return "Dinas Perhubungan"
+    return str(text).title()
+
+def clean_kecamatan(text):
+    if pd.isna(text) or str(text).strip() in ["-", "", "nan"]: return "Tidak Diketahui"
+    # Nama kanonik dari gazetteer (tahan salah eja); di luar gazetteer tetap title-case
+    canonical = gazetteer.load_gazetteer().canonical(text)
+    return canonical if canonical else str(text).title().strip()
+
+def clean_status(text):
+    text = str(text).title().strip()
+    return "Diproses" if text in ["Nan", "nan", "-", ""] else text
+
+STATUS_WAKTU = ["✅ Selesai", "🔥 TERLAMBAT", "⚠️ Warning", "🟢 Aman"]
+
+# --- NORMALISASI NILAI UNIK ---
+def normalize_unique(values, clean):
+    """Jalankan fungsi clean sekali per nilai mentah yang berbeda, hasilnya Categorical.
+
+    Kolom dimensi hanya punya beberapa ratus nilai unik, jadi jauh lebih murah
+    daripada .apply per baris; hasil dipetakan kembali lewat kode factorize.
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    cleaned = [clean(u) for u in uniques]
+    if (codes < 0).any():
+        codes = np.where(codes < 0, len(cleaned), codes)
+        cleaned.append(clean(np.nan))
+    categories = sorted(set(cleaned))
+    lookup = {c: i for i, c in enumerate(categories)}
+    mapped = np.array([lookup[c] for c in cleaned], dtype=np.int32)
+    return pd.Categorical.from_codes(mapped[codes], categories=categories)
+
+# --- FUNGSI MENCARI FILE ---
+def get_file_path():
+    """Folder export (LAPOR_DATA_DIR, default data/) jika berisi file; jika tidak, satu file lama."""
+    if ingest.list_exports(ingest.DATA_DIR): return ingest.DATA_DIR
+    possible_files = [
+        "sp4n-lapor_2021-2024.xlsx - Sheet1.csv",
+        "sp4n-lapor_2021-2024.csv",
+        "sp4n-lapor_2021-2024.xlsx"
+    ]
+    return next((f for f in possible_files if os.path.exists(f)), None)
+
+def read_source(file_path):
+    if os.path.isdir(file_path):
+        return ingest.read_directory(file_path)
+    if str(file_path).endswith('.xlsx'):
+        return pd.read_excel(file_path, engine='openpyxl')
+    return pd.read_csv(file_path)
+
+# --- FUNGSI BANGUN DATA ---
+def build_frame(file_path):
+    """Baca file sumber lalu bersihkan & skor seluruh laporan."""
+    return finish_frame(clean_frame(read_source(file_path)))
+
+def clean_frame(df):
+    """Bersihkan & skor frame mentah (kolom seperti sp4n-lapor_2021-2024.xlsx)."""
+    df = df.copy()
+    col_map = {
+        'tanggal_masuk': 'Tanggal Laporan Masuk',
+        'kategori': 'Kategori',
+        'dinas_tujuan': 'Instansi Terdisposisi',
+        'isi_laporan_awal': 'Isi Laporan Awal',
+        'isi_laporan_akhir': 'Isi Laporan Akhir',
+        'tracking_id': 'Tracking ID',
+        'status_final': 'Status Final',
+        'kecamatan_final': 'Kecamatan'
+    }
+    df.rename(columns=col_map, inplace=True)
+
+    required = ['Tanggal Laporan Masuk', 'Kategori', 'Isi Laporan Awal', 'Status Final']
+    for c in required:
+        if c not in df.columns: df[c] = "-"
+
+    if 'Tracking ID' not in df.columns:
+        df['Tracking ID'] = df.index.astype(str)
+    else:
+        df['Tracking ID'] = df['Tracking ID'].astype(str).str.replace(r'\.0$', '', regex=True)
+
+    if 'Isi Laporan Akhir' not in df.columns: df['Isi Laporan Akhir'] = "-"
+    if 'Kecamatan' not in df.columns: df['Kecamatan'] = "Tidak Diketahui"
+
+    df['Status_Clean'] = normalize_unique(df['Status Final'], clean_status)
+
+    df['Tanggal_Parsed'] = pd.to_datetime(df['Tanggal Laporan Masuk'], errors='coerce')
+    df['Tahun'] = df['Tanggal_Parsed'].dt.year
+    df['Bulan'] = df['Tanggal_Parsed'].dt.to_period('M').astype(str)
+
+    df['Target_Selesai'] = df['Tanggal_Parsed'] + pd.Timedelta(days=SLA_HARI)
+
+    df['Kategori_Clean'] = normalize_unique(df['Kategori'], clean_category_name)
+    df['Instansi_Clean'] = normalize_unique(df['Instansi Terdisposisi'], clean_agency_name)
+    df['Kecamatan_Clean'] = normalize_unique(df['Kecamatan'], clean_kecamatan)
+
+    # 5. SCORING PRIORITY & SENTIMENT (bagian yang tidak bergantung pada tanggal)
+    compiled = scoring.compile_keywords(scoring.load_keywords())
+    df['Skor_Kata'], df['Jumlah_Negatif'] = scoring.score_texts(df['Isi Laporan Awal'], compiled)
+    return df
+
+# --- TAHAP ATAS SELURUH FRAME ---
+def finish_frame(df, start=0):
+    """Klasifikasi model (jika sudah dilatih) lalu dedup; dijalankan setelah clean_frame.
+
+    Baris sebelum `start` sudah diproses di build sebelumnya (ingest
+    inkremental): hanya baris baru yang diklasifikasi & di-dedup.
+    """
+    model = klasifikasi.load_model()
+    if model is not None: df = klasifikasi.apply_model(df, model, start)
+    else: df['Kategori_Prediksi'] = df['Kategori_Prediksi'].eq(True) if 'Kategori_Prediksi' in df.columns else False
+    return add_incidents(df, start)
+
+def add_incidents(df, start=0):
+    """Insiden_ID per laporan (laporan hampir-sama digabung) & penanda laporan pertamanya."""
+    if start and 'Insiden_ID' in df.columns: df['Insiden_ID'] = dedup.extend_incident_ids(df)
+    else: df['Insiden_ID'] = dedup.incident_ids(df)
+    df['Insiden_Utama'] = df['Insiden_ID'] == df['Tracking ID']
+    return df
+
+# --- KOLOM SLA (DIHITUNG ULANG SETIAP RERUN) ---
+def apply_sla(df, today=None):
+    """Tambahkan kolom yang bergantung pada jam sekarang ke frame hasil build_frame."""
+    if today is None: today = pd.Timestamp.now()
+    df = df.copy(deep=False)
+
+    df['Sisa_Hari'] = (df['Target_Selesai'] - today).dt.days
+    selesai = df['Status_Clean'] == 'Selesai'
+    df['Terlambat'] = (df['Sisa_Hari'] < 0) & ~selesai
+    df['Status_Waktu'] = pd.Categorical.from_codes(
+        np.select([selesai, df['Sisa_Hari'] < 0, df['Sisa_Hari'] <= 2], [0, 1, 2], 3),
+        categories=STATUS_WAKTU
+    )
+
+    df['Final_Score'], df['Label_Prioritas'], df['Sentiment_Score'] = scoring.finalize(
+        df['Skor_Kata'].to_numpy(), df['Jumlah_Negatif'].to_numpy(), df['Terlambat'].to_numpy()
+    )
+    return df
+
+def load_cleaned(file_path):
+    """Frame bersih dari snapshot Parquet; xlsx hanya diparse ulang jika berubah.
+
+    file_path boleh berupa folder export: file baru ditambahkan secara inkremental.
+    """
+    keywords = scoring.keywords_signature(scoring.load_keywords())
+    key = f"v{PIPELINE_VERSION}:{keywords}:{gazetteer.signature()}:{klasifikasi.signature()}"
+    if os.path.isdir(file_path):
+        return ingest.load_directory(file_path, clean_frame, extra_key=key, finish=finish_frame)
+    return snapshot.load_frame(file_path, build_frame, extra_key=key)
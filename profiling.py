@@ -0,0 +1,126 @@
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+# Instrumentasi per script run: waktu tiap bagian bernama, jumlah baris yang
+# disentuh, serta hit/miss cache data & AI. Satu RunProfile dibuat di awal
+# setiap run (lihat app.py), ditampilkan di panel admin pada sidebar dan
+# ditambahkan sebagai satu baris JSON ke LOG_FILE untuk dianalisis belakangan.
+LOG_FILE = os.environ.get('LAPOR_PROFILE_LOG', str(Path(__file__).resolve().parent / '.cache' / 'profiling.jsonl'))
+
+_local = threading.local()
+_totals_lock = threading.Lock()
+# Hit/miss kumulatif sejak proses berjalan, termasuk dari thread pekerja
+_totals = Counter()
+
+
+class RunProfile:
+    def __init__(self, run_id=None, label='run'):
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.label = label
+        self.started = time.perf_counter()
+        self.sections = []
+        self.cache = Counter()
+
+    @contextmanager
+    def section(self, name, rows=None):
+        """Ukur blok `with`; isi info['rows'] di dalam blok untuk mencatat jumlah baris."""
+        info = {'name': name, 'rows': rows}
+        start = time.perf_counter()
+        try:
+            yield info
+        finally:
+            info['ms'] = round((time.perf_counter() - start) * 1000, 2)
+            self.sections.append(info)
+
+    def count(self, cache, hit):
+        self.cache[f"{cache}_{'hit' if hit else 'miss'}"] += 1
+
+    def total_ms(self):
+        return round((time.perf_counter() - self.started) * 1000, 2)
+
+    def table(self):
+        df = pd.DataFrame(self.sections, columns=['name', 'ms', 'rows'])
+        return df.rename(columns={'name': 'Bagian', 'ms': 'Waktu (ms)', 'rows': 'Baris'})
+
+    def record(self):
+        return {
+            'ts': datetime.now().isoformat(timespec='seconds'),
+            'run_id': self.run_id,
+            'label': self.label,
+            'total_ms': self.total_ms(),
+            'sections': self.sections,
+            'cache': dict(self.cache),
+        }
+
+    def write(self, path=LOG_FILE):
+        """Tambahkan run ini ke log JSON-lines; gagal menulis tidak boleh mengganggu dashboard."""
+        if not path: return
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(self.record(), default=str) + '\n')
+        except OSError:
+            pass
+
+
+def start_run(label='run'):
+    """Mulai profil baru untuk script run (atau fragment) di thread ini."""
+    _local.profile = RunProfile(label=label)
+    return _local.profile
+
+
+def current():
+    return getattr(_local, 'profile', None)
+
+
+def count(cache, hit):
+    """Catat hit/miss ke total proses dan ke run aktif di thread ini (jika ada)."""
+    with _totals_lock:
+        _totals[f"{cache}_{'hit' if hit else 'miss'}"] += 1
+    prof = current()
+    if prof is not None: prof.count(cache, hit)
+
+
+def totals():
+    with _totals_lock:
+        return dict(_totals)
+
+
+def cached(name, cache):
+    """Bungkus st.cache_data/st.cache_resource dan hitung hit/miss-nya.
+
+    Badan fungsi hanya dijalankan saat miss, jadi setiap panggilan yang tidak
+    melewati badan fungsi adalah hit.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def body(*args, **kwargs):
+            _local.missed = True
+            return fn(*args, **kwargs)
+
+        cached_fn = cache(body)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            outer = getattr(_local, 'missed', False)
+            _local.missed = False
+            try:
+                result = cached_fn(*args, **kwargs)
+                count(name, not _local.missed)
+                return result
+            finally:
+                _local.missed = outer
+
+        wrapper.clear = cached_fn.clear
+        return wrapper
+    return decorator
@@ -0,0 +1,196 @@
+import argparse
+import html
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+import charts
+import cube
+import gis
+import status_store
+from pipeline import apply_sla, get_file_path, load_cleaned
+
+# Laporan statis per tahun (dan opsional per kecamatan) tanpa Streamlit:
+# KPI, tren bulanan, Top 5 instansi, Top 10 kategori dan peta kecamatan,
+# sama dengan Tab 1 & Tab 3. Data dimuat dan di-cube sekali di proses utama;
+# cube (ratusan ribu sel, bukan jutaan baris) dikirim sekali ke tiap pekerja
+# lalu setiap slice dirender paralel ke satu file HTML (+ PNG jika kaleido ada).
+OUT_DIR = 'reports'
+MAX_WORKERS = os.cpu_count() or 1
+
+PAGE = """<!DOCTYPE html>
+<html lang="id"><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 24px; color: #264653; }}
+.kpi {{ display: flex; gap: 16px; margin-bottom: 24px; }}
+.kpi div {{ flex: 1; border: 1px solid #ddd; border-radius: 8px; padding: 12px; }}
+.kpi b {{ display: block; font-size: 24px; margin-top: 4px; }}
+.grid {{ display: grid; grid-template-columns: 2fr 1fr; gap: 16px; }}
+iframe {{ width: 100%; height: 520px; border: 0; }}
+</style></head><body>
+<h1>{title}</h1>
+<p>Dibuat {created} dari {source}</p>
+<div class="kpi">
+<div>Total Laporan<b>{total}</b></div>
+<div>Overdue (Terlambat)<b>{overdue}</b></div>
+<div>Tingkat Penyelesaian<b>{persen:.1f}%</b></div>
+<div>Isu Terbanyak<b>{top_isu}</b></div>
+</div>
+<div class="grid"><div><h2>Tren Laporan Masuk</h2>{trend}</div><div><h2>Instansi Top 5</h2>{pie}</div></div>
+<h2>Top 10 Kategori Masalah</h2>{bar}
+<h2>Peta Sebaran Laporan per Kecamatan</h2>{peta}
+</body></html>
+"""
+
+INDEX = """<!DOCTYPE html>
+<html lang="id"><head><meta charset="utf-8"><title>Laporan SP4N LAPOR</title></head><body>
+<h1>Laporan SP4N LAPOR</h1><ul>
+{items}
+</ul></body></html>
+"""
+
+# Cube milik proses pekerja, dikirim sekali lewat initializer
+_cube = None
+
+
+def _init_worker(data_cube):
+    global _cube
+    _cube = data_cube
+
+
+def slug(text):
+    return re.sub(r'[^a-z0-9]+', '-', str(text).lower()).strip('-')
+
+
+def slice_name(tahun, kecamatan=None):
+    return f"{tahun}" if kecamatan is None else f"{tahun}_{slug(kecamatan)}"
+
+
+def slice_title(tahun, kecamatan=None):
+    return f"Monitoring Laporan {tahun}" + ("" if kecamatan is None else f" — Kecamatan {kecamatan}")
+
+
+def plan_slices(df, years=None, kecamatan=None):
+    """Daftar (tahun, kecamatan|None, overdue) yang akan dirender.
+
+    kecamatan=None -> hanya per tahun; ['all'] -> semua kecamatan yang punya
+    laporan di tahun itu; selain itu nama kecamatan yang diminta.
+    """
+    df = df[df['Tahun'].notna()]
+    overdue = df[df['Terlambat']].groupby(['Tahun', 'Kecamatan_Clean'], observed=True).size()
+    tahun_ada = sorted(df['Tahun'].astype(int).unique())
+    years = tahun_ada if not years else [y for y in years if y in tahun_ada]
+
+    per_tahun = overdue.groupby(level=0).sum()
+    slices = [(y, None, int(per_tahun.get(y, 0))) for y in years]
+    if kecamatan:
+        pairs = df.groupby(['Tahun', 'Kecamatan_Clean'], observed=True).size().index
+        for y, kec in pairs:
+            y = int(y)
+            if y not in years or kec == 'Tidak Diketahui': continue
+            if kecamatan != ['all'] and kec not in kecamatan: continue
+            slices.append((y, kec, int(overdue.get((y, kec), 0))))
+    return slices
+
+
+def _figure_html(fig, include_plotlyjs):
+    return fig.to_html(full_html=False, include_plotlyjs=include_plotlyjs)
+
+
+def render_slice(tahun, kecamatan, overdue, out_dir, source='', png=False):
+    """Tulis satu file HTML (dan PNG grafik jika diminta); dijalankan di proses pekerja."""
+    filters = {'Tahun': tahun} if kecamatan is None else {'Tahun': tahun, 'Kecamatan_Clean': kecamatan}
+    view = cube.slice_cube(_cube, **filters)
+    k = charts.kpis(view, overdue)
+    figures = {'trend': charts.trend_figure(view), 'pie': charts.instansi_pie(view), 'bar': charts.kategori_bar(view)}
+
+    agg = gis.aggregate_cube(view)
+    map_html = gis.render_map(agg[agg['kecamatan'] != "Tidak Diketahui"])
+    peta = f'<iframe srcdoc="{html.escape(map_html)}"></iframe>' if map_html else '<p>Data GIS tidak ditemukan.</p>'
+
+    name = slice_name(tahun, kecamatan)
+    page = PAGE.format(
+        title=html.escape(slice_title(tahun, kecamatan)),
+        created=datetime.now().strftime('%Y-%m-%d %H:%M'),
+        source=html.escape(str(source)),
+        total=k['total'], overdue=k['overdue'], persen=k['persen_selesai'], top_isu=html.escape(str(k['top_isu'])),
+        trend=_figure_html(figures['trend'], 'cdn'),
+        pie=_figure_html(figures['pie'], False),
+        bar=_figure_html(figures['bar'], False),
+        peta=peta,
+    )
+    out = Path(out_dir) / f"{name}.html"
+    out.write_text(page, encoding='utf-8')
+
+    written = [out]
+    if png:
+        for key, fig in figures.items():
+            path = Path(out_dir) / f"{name}_{key}.png"
+            fig.write_image(path)
+            written.append(path)
+    return written
+
+
+def load_frame(source):
+    """Frame bersih + jurnal status + kolom SLA, sama dengan yang dilihat dashboard."""
+    df = load_cleaned(source)
+    df = status_store.apply_updates(df, status_store.pending_updates())
+    return apply_sla(df)
+
+
+def build(source, out_dir=OUT_DIR, years=None, kecamatan=None, workers=MAX_WORKERS, png=False):
+    df = load_frame(source)
+    slices = plan_slices(df, years, kecamatan)
+    data_cube = cube.build_cube(df)
+    del df
+
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    written = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data_cube,)) as pool:
+        futures = {pool.submit(render_slice, y, kec, od, out_dir, source, png): (y, kec) for y, kec, od in slices}
+        for fut in as_completed(futures):
+            y, kec = futures[fut]
+            paths = fut.result()
+            written += paths
+            print(f"  {slice_title(y, kec)} -> {paths[0]}")
+
+    items = "\n".join(
+        f'<li><a href="{slice_name(y, kec)}.html">{html.escape(slice_title(y, kec))}</a></li>'
+        for y, kec, _ in slices
+    )
+    index = Path(out_dir) / 'index.html'
+    index.write_text(INDEX.format(items=items), encoding='utf-8')
+    return [index] + written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Bangun laporan statis SP4N LAPOR per tahun/kecamatan.')
+    parser.add_argument('--source', help='file atau folder export (default: sama dengan dashboard)')
+    parser.add_argument('--out', default=OUT_DIR, help='folder tujuan')
+    parser.add_argument('--years', nargs='+', type=int, help='tahun yang dirender (default: semua)')
+    parser.add_argument('--kecamatan', nargs='+', help="juga render per kecamatan: nama kecamatan atau 'all'")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS)
+    parser.add_argument('--png', action='store_true', help='juga simpan grafik sebagai PNG (butuh kaleido)')
+    args = parser.parse_args(argv)
+
+    source = args.source or get_file_path()
+    if not source:
+        print('File sumber tidak ditemukan.', file=sys.stderr)
+        return 1
+    if args.png:
+        try:
+            import kaleido  # noqa: F401
+        except ImportError:
+            print('kaleido tidak terpasang; PNG dilewati (pip install kaleido).', file=sys.stderr)
+            args.png = False
+
+    written = build(source, args.out, args.years, args.kecamatan, args.workers, args.png)
+    print(f'{len(written)} file ditulis ke {args.out}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
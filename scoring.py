@@ -0,0 +1,129 @@
+import hashlib
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Tabel kata kunci bisa diubah lewat file ini tanpa menyentuh kode.
+KEYWORDS_FILE = Path(__file__).resolve().parent / 'scoring_keywords.json'
+
+DEFAULT_KEYWORDS = {
+    'keywords_critical': {'banjir':30, 'kebakaran':40, 'longsor':40, 'kecelakaan':35, 'meninggal':50, 'korban':40},
+    'keywords_complaint': {'parah':10, 'lambat':5, 'rusak':10, 'bau':10, 'macet':10, 'sampah':10, 'pungli':20},
+    'negative_words': ['parah', 'kecewa', 'lambat', 'rusak', 'bau', 'macet', 'pungli', 'bodoh', 'malas', 'susah', 'emosi', 'lama', 'ribet'],
+}
+
+LABEL_CRITICAL = "🔴 CRITICAL"
+LABEL_WARNING = "🟡 WARNING"
+LABEL_NORMAL = "🟢 NORMAL"
+
+OVERDUE_BONUS = 50
+
+
+def load_keywords(path=KEYWORDS_FILE):
+    """Baca tabel kata kunci dari JSON; tabel yang tidak ada memakai nilai bawaan."""
+    tables = dict(DEFAULT_KEYWORDS)
+    if path and Path(path).exists():
+        with open(path, encoding='utf-8') as f:
+            tables.update(json.load(f))
+    return tables
+
+
+def keywords_signature(tables):
+    return hashlib.sha1(json.dumps(tables, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+
+
+def compile_keywords(tables):
+    """Gabungkan ketiga tabel menjadi satu kosakata dengan vektor bobot.
+
+    Semua kata dicari sekaligus dengan satu regex gabungan, walaupun muncul
+    di lebih dari satu tabel.
+    """
+    words, slot = [], {}
+
+    def index_of(w):
+        w = str(w).lower()
+        if w not in slot:
+            slot[w] = len(words)
+            words.append(w)
+        return slot[w]
+
+    weighted = list(tables['keywords_critical'].items()) + list(tables['keywords_complaint'].items())
+    for w, _ in weighted: index_of(w)
+    for w in tables['negative_words']: index_of(w)
+
+    is_float = any(isinstance(v, float) for _, v in weighted)
+    weight = np.zeros(len(words), dtype=np.float64 if is_float else np.int64)
+    negative = np.zeros(len(words), dtype=np.int64)
+    for w, v in weighted: weight[index_of(w)] += v
+    for w in tables['negative_words']: negative[index_of(w)] += 1
+    return {'words': words, 'weight': weight, 'negative': negative, **keyword_pattern(words)}
+
+
+def _trie_regex(node):
+    """Regex dari trie kata: cabang per huruf, jadi biaya per posisi teks tidak naik dengan jumlah kata."""
+    alts = [re.escape(ch) + _trie_regex(child) for ch, child in sorted(node.items()) if ch]
+    if not alts: return ''
+    body = alts[0] if len(alts) == 1 else '(?:' + '|'.join(alts) + ')'
+    # Kata yang berakhir di sini: lanjutan opsional & greedy, kata terpanjang menang
+    return '(?:' + body + ')?' if '' in node else body
+
+
+def keyword_pattern(words):
+    """Regex gabungan semua kata + matriks awalan (kata i diawali kata j).
+
+    Lookahead membuat setiap posisi teks diperiksa, jadi kata yang tumpang
+    tindih tetap ketemu. Di satu posisi hanya kata terpanjang yang dilaporkan;
+    kata lain yang cocok di posisi itu pasti awalannya, diturunkan lewat prefix.
+    """
+    trie = {}
+    for w in words:
+        node = trie
+        for ch in w: node = node.setdefault(ch, {})
+        node[''] = {}
+    pattern = re.compile('(?=(' + _trie_regex(trie) + '))') if words else None
+    prefix = np.array([[w.startswith(v) for v in words] for w in words], dtype=np.int32).reshape(len(words), len(words))
+    return {'pattern': pattern, 'prefix': prefix}
+
+
+def keyword_matrix(texts, compiled):
+    """Matriks boolean (laporan x kata): apakah kata muncul di teks laporan.
+
+    Satu kali pindai regex gabungan per teks unik (laporan duplikat dipindai sekali).
+    """
+    lowered = texts.astype(str).str.lower()
+    words = compiled['words']
+    if not words:
+        return np.zeros((len(lowered), 0), dtype=bool)
+    codes, uniques = pd.factorize(lowered)
+    slot = {w: i for i, w in enumerate(words)}
+    found = np.zeros((len(uniques), len(words)), dtype=np.int32)
+    for row, text in enumerate(uniques):
+        for w in set(compiled['pattern'].findall(text)): found[row, slot[w]] = 1
+    return ((found @ compiled['prefix']) > 0)[codes]
+
+
+def score_texts(texts, compiled):
+    """Skor kata kunci dan jumlah kata negatif per laporan, belum termasuk bonus overdue."""
+    hits = keyword_matrix(texts, compiled)
+    base = hits.astype(compiled['weight'].dtype) @ compiled['weight']
+    negatives = hits.astype(np.int64) @ compiled['negative']
+    return base, negatives
+
+
+def finalize(base, negatives, overdue):
+    """Terapkan bonus overdue lalu hitung Final_Score, Label_Prioritas, Sentiment_Score."""
+    overdue = np.asarray(overdue, dtype=bool)
+    score = np.minimum(np.asarray(base) + OVERDUE_BONUS * overdue, 100)
+    sentiment = np.minimum(1 + 0.5 * np.asarray(negatives) + overdue, 5)
+    label = np.select([score >= 50, score >= 20], [LABEL_CRITICAL, LABEL_WARNING], LABEL_NORMAL)
+    return score, label, sentiment
+
+
+def score_frame(texts, overdue, compiled=None):
+    if compiled is None:
+        compiled = compile_keywords(load_keywords())
+    base, negatives = score_texts(texts, compiled)
+    return finalize(base, negatives, overdue)
@@ -0,0 +1,204 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Index full-text atas Isi Laporan Awal + Isi Laporan Akhir. Dibangun sekali
+# saat data dimuat (matriks dokumen-term dari scikit-learn, disimpan per kolom
+# sebagai posting list berbobot BM25); perubahan dari Admin Center ditempelkan
+# sebagai overlay kecil tanpa membangun ulang index. Query kata kunci dijawab
+# dengan menggabungkan posting list; frasa "..." diverifikasi pada kandidat saja.
+TEXT_COLUMNS = ['Isi Laporan Awal', 'Isi Laporan Akhir']
+
+# Parameter BM25
+K1 = 1.2
+B = 0.75
+
+STOPWORDS = frozenset("""
+ada adalah agar akan aku anda apa apakah atau bagaimana bahwa banyak belum bisa bpk buat
+dalam dan dapat dari demikian dengan di dia dong harus hal hanya ia ibu ini itu jadi jika
+juga kalau kami kamu karena ke kepada kita lagi lah mereka maka masih mau mohon namun nya
+oleh pada para pak per saat saja sampai sangat saya se sebagai sedang sehingga sejak
+selama semua seperti serta setelah sudah supaya tapi telah tentang terhadap tersebut
+tetapi untuk walaupun yang yg yth
+""".split())
+
+# Singkatan umum di laporan warga -> bentuk baku
+ALIASES = {
+    'jl': 'jalan', 'jln': 'jalan', 'kec': 'kecamatan', 'kab': 'kabupaten', 'kel': 'kelurahan',
+    'ds': 'desa', 'tdk': 'tidak', 'gak': 'tidak', 'ga': 'tidak', 'nggak': 'tidak', 'blm': 'belum',
+    'sdh': 'sudah', 'udh': 'sudah', 'krn': 'karena', 'dgn': 'dengan', 'utk': 'untuk', 'dr': 'dari',
+    'bansos': 'bantuan sosial', 'pju': 'lampu jalan',
+}
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+# Partikel/klitik yang menempel di akhir kata: rusaknya -> rusak, kapankah -> kapan
+_SUFFIX = re.compile(r'(?<=[a-z]{3})(nya|lah|kah|pun)$')
+
+
+def tokenize(text):
+    """Token huruf kecil tanpa stopword; singkatan dibakukan dan partikel akhir dibuang."""
+    out = []
+    for tok in _TOKEN.findall(str(text).lower()):
+        tok = _SUFFIX.sub('', tok)
+        for t in ALIASES.get(tok, tok).split():
+            if len(t) > 1 and t not in STOPWORDS: out.append(t)
+    return out
+
+
+def parse_query(query):
+    """(term wajib, daftar frasa); frasa ditulis di antara tanda kutip."""
+    phrases = [p.strip() for p in re.findall(r'"([^"]+)"', query) if p.strip()]
+    terms = tokenize(re.sub(r'"[^"]*"', ' ', query))
+    for p in phrases: terms += tokenize(p)
+    return list(dict.fromkeys(terms)), phrases
+
+
+def _phrase_pattern(phrase):
+    words = _TOKEN.findall(phrase.lower())
+    return re.compile(r'\b' + r'\W+'.join(map(re.escape, words)) + r'\b', re.I) if words else None
+
+
+def document_text(awal, akhir):
+    return awal.fillna('').astype(str) + ' ' + akhir.fillna('').astype(str)
+
+
+def term_counts(texts):
+    """Matriks CSR (dokumen x term) beserta vocabulary term hasil tokenize().
+
+    Teks dipecah dulu per kata mentah (CountVectorizer), lalu kolom kata mentah
+    dipetakan ke term baku lewat perkalian matriks; tokenize() cukup dipanggil
+    sekali per kata unik, bukan per dokumen. Teks yang sama dihitung sekali.
+    """
+    from scipy import sparse
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    codes, uniques = pd.factorize(pd.Series(texts, dtype=object), use_na_sentinel=False)
+    vectorizer = CountVectorizer(token_pattern=_TOKEN.pattern, dtype=np.float32)
+    try:
+        raw = vectorizer.fit_transform(uniques.astype(str))
+    except ValueError:  # semua teks kosong
+        return sparse.csr_matrix((len(codes), 0), dtype=np.float32), {}
+
+    vocab, src, dst = {}, [], []
+    for word, col in vectorizer.vocabulary_.items():
+        for term in tokenize(word):
+            src.append(col)
+            dst.append(vocab.setdefault(term, len(vocab)))
+    mapping = sparse.csr_matrix((np.ones(len(src), dtype=np.float32), (src, dst)), shape=(raw.shape[1], len(vocab)))
+    counts = (raw @ mapping).tocsr()
+    return counts[codes], vocab
+
+
+class SearchIndex:
+    def __init__(self, df):
+        self.n_rows = len(df)
+        self._awal = df[TEXT_COLUMNS[0]].to_numpy(dtype=object)
+        self._texts = document_text(df[TEXT_COLUMNS[0]], df[TEXT_COLUMNS[1]]).to_numpy(dtype=object)
+        counts, self.vocab = term_counts(self._texts)
+
+        if counts.nnz == 0:
+            self._indptr = np.zeros(1, dtype=np.int64)
+            self._rows = np.array([], dtype=np.int64)
+            self._weights = np.array([], dtype=np.float32)
+            self.idf = np.array([], dtype=np.float32)
+            self.avgdl = 1.0
+        else:
+            doc_len = np.asarray(counts.sum(axis=1)).ravel()
+            self.avgdl = float(doc_len.mean()) or 1.0
+            df_t = np.bincount(counts.indices, minlength=counts.shape[1])
+            self.idf = np.log1p((self.n_rows - df_t + 0.5) / (df_t + 0.5)).astype(np.float32)
+
+            # Bobot BM25 per (dokumen, term) dihitung sekali; query tinggal menjumlahkan
+            row_of = np.repeat(np.arange(self.n_rows), np.diff(counts.indptr))
+            norm = K1 * (1 - B + B * doc_len[row_of] / self.avgdl)
+            counts.data = self.idf[counts.indices] * counts.data * (K1 + 1) / (counts.data + norm)
+            postings = counts.tocsc()
+            postings.sort_indices()
+            self._indptr = postings.indptr
+            self._rows = postings.indices.astype(np.int64)
+            self._weights = postings.data.astype(np.float32)
+
+        # Overlay perubahan Admin Center: posisi baris -> {term: bobot}
+        self._overlay = {}
+        self._applied = {}
+
+    # --- PEMBARUAN INKREMENTAL ---
+    def _weights_for(self, text):
+        tokens = tokenize(text)
+        if not tokens: return {}
+        tf = pd.Series(tokens).value_counts()
+        norm = K1 * (1 - B + B * len(tokens) / self.avgdl)
+        out = {}
+        for term, f in tf.items():
+            idf = self.idf[self.vocab[term]] if term in self.vocab else float(np.log1p(self.n_rows + 0.5))
+            out[term] = float(idf * f * (K1 + 1) / (f + norm))
+        return out
+
+    def update(self, pos, akhir):
+        """Ganti Isi Laporan Akhir di posisi `pos` (mis. setelah bukti penyelesaian diisi)."""
+        awal = self._awal[pos]
+        text = f"{'' if pd.isna(awal) else awal} {'' if pd.isna(akhir) else akhir}"
+        self._texts[pos] = text
+        self._overlay[int(pos)] = self._weights_for(text)
+
+    def sync(self, updates, id_index):
+        """Terapkan entri jurnal status yang belum pernah diterapkan ke index ini."""
+        if updates.empty: return
+        fresh = [tid for tid, ts in updates['updated_at'].items() if self._applied.get(tid) != ts]
+        if not fresh: return
+        for tid in fresh: self._applied[tid] = updates.at[tid, 'updated_at']
+        pos = id_index.get_indexer_for(fresh)
+        for p in pos[pos >= 0]: self.update(p, updates.at[id_index[p], 'bukti'])
+
+    # --- QUERY ---
+    def _postings(self, term):
+        col = self.vocab.get(term)
+        if col is None: return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+        lo, hi = self._indptr[col], self._indptr[col + 1]
+        return self._rows[lo:hi], self._weights[lo:hi]
+
+    def search(self, query, rows=None, limit=50):
+        """(posisi baris, skor) terurut dari yang paling relevan.
+
+        Semua term harus muncul (AND); `rows` membatasi hasil ke himpunan
+        baris hasil filter (None = semua baris).
+        """
+        terms, phrases = parse_query(query)
+        if not terms: return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+
+        parts = [self._postings(t) for t in terms]
+        cand = np.concatenate([p[0] for p in parts])
+        weight = np.concatenate([p[1] for p in parts])
+        overlay = dict(self._overlay)  # index dipakai bersama antar sesi
+        if overlay:
+            # Baris yang diubah dinilai dari overlay, bukan dari posting lama
+            stale = np.fromiter(overlay, dtype=np.int64)
+            keep = ~np.isin(cand, stale)
+            cand, weight = cand[keep], weight[keep]
+            extra = [(p, sum(w[t] for t in terms)) for p, w in overlay.items() if all(t in w for t in terms)]
+        else:
+            extra = []
+
+        uniq, inverse, hits = np.unique(cand, return_inverse=True, return_counts=True)
+        score = np.bincount(inverse, weights=weight, minlength=len(uniq))
+        found = hits == len(terms)
+        uniq, score = uniq[found], score[found]
+        if extra:
+            uniq = np.concatenate([uniq, np.array([p for p, _ in extra], dtype=np.int64)])
+            score = np.concatenate([score, np.array([s for _, s in extra])])
+
+        if rows is not None:
+            keep = np.isin(uniq, rows, assume_unique=True)
+            uniq, score = uniq[keep], score[keep]
+
+        order = np.argsort(-score, kind='stable')
+        uniq, score = uniq[order], score[order]
+        if phrases:
+            patterns = [p for p in map(_phrase_pattern, phrases) if p is not None]
+            ok = [all(p.search(self._texts[i]) for p in patterns) for i in uniq[:max(limit * 20, 1000)]]
+            uniq, score = uniq[:len(ok)][ok], score[:len(ok)][ok]
+        return uniq[:limit], score[:limit]
+
+    def count(self, query, rows=None):
+        return len(self.search(query, rows, limit=self.n_rows)[0])
@@ -0,0 +1,241 @@
+import csv
+import io
+import os
+import re
+import sqlite3
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import ingest
+import pipeline
+
+# Jurnal perubahan status dari Admin Center. File sumber (xlsx/csv) tidak
+# ditulis ulang setiap kali laporan ditutup; perubahan disimpan di SQLite
+# (tracking_id sebagai PRIMARY KEY = ter-index) lalu ditempelkan ke frame
+# yang sudah di-cache. Penulisan ke file sumber dilakukan lewat compact().
+DB_PATH = Path(__file__).resolve().parent / 'status_updates.sqlite3'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS status_updates (
+    tracking_id TEXT PRIMARY KEY,
+    status      TEXT NOT NULL,
+    bukti       TEXT,
+    updated_at  TEXT NOT NULL
+)
+"""
+
+# Kolom frame bersih yang diubah oleh apply_updates()
+OVERLAY_COLUMNS = ['Status_Clean', 'Status Final', 'Isi Laporan Akhir']
+
+
+@contextmanager
+def connect(db_path=DB_PATH):
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(SCHEMA)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def record_update(tracking_id, bukti_text, status='Selesai', db_path=DB_PATH):
+    record_updates([(tracking_id, status, bukti_text)], db_path)
+
+
+def record_updates(rows, db_path=DB_PATH):
+    """Simpan banyak (tracking_id, status, bukti) dalam satu transaksi."""
+    now = datetime.now().isoformat()
+    with connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO status_updates (tracking_id, status, bukti, updated_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(tracking_id) DO UPDATE SET status=excluded.status, bukti=excluded.bukti, updated_at=excluded.updated_at",
+            [(str(tid), status, bukti, now) for tid, status, bukti in rows]
+        )
+
+
+def pending_updates(db_path=DB_PATH):
+    """Semua perubahan yang belum ditulis ke file sumber, di-index dengan Tracking ID."""
+    with connect(db_path) as conn:
+        updates = pd.read_sql_query("SELECT tracking_id, status, bukti, updated_at FROM status_updates", conn)
+    return updates.set_index('tracking_id')
+
+
+def apply_updates(df, updates, id_index=None):
+    """Tempelkan perubahan status ke frame bersih; hanya baris yang berubah yang disentuh."""
+    if updates.empty: return df
+    if id_index is None: id_index = pd.Index(df['Tracking ID'])
+
+    positions = id_index.get_indexer_for(updates.index)
+    found = positions >= 0
+    if not found.any(): return df
+    # get_indexer_for mengembalikan semua posisi jika ID ganda, susun ulang nilainya
+    matched = id_index[positions[found]]
+    status = updates['status'].reindex(matched).to_numpy()
+    bukti = updates['bukti'].reindex(matched).to_numpy()
+    positions = positions[found]
+
+    df = df.copy(deep=False)
+    for col, values in zip(OVERLAY_COLUMNS, [status, status, bukti]):
+        patched = df[col].copy()
+        if isinstance(patched.dtype, pd.CategoricalDtype):
+            missing = pd.Index(values).unique().difference(patched.cat.categories)
+            if len(missing): patched = patched.cat.add_categories(missing)
+        patched.iloc[positions] = values
+        df[col] = patched
+    return df
+
+
+# --- PENYELESAIAN MASSAL ---
+BULK_COLUMNS = ['Tracking ID', 'Bukti']
+
+
+BULK_HEADER_WORDS = {'tracking', 'id', 'bukti', 'akhir'}
+
+
+def _is_header(cells):
+    """Baris pertama adalah judul jika memuat nama kolom yang dikenal dan tidak memuat Tracking ID (angka)."""
+    cells = [str(c).strip().lower() for c in cells]
+    if any(re.fullmatch(r'\d+(\.0)?', c) for c in cells): return False
+    return any(BULK_HEADER_WORDS & set(re.split(r'[\s_]+', c)) for c in cells)
+
+
+def _sniff_sep(text):
+    # Excel locale id-ID menyimpan CSV dengan titik koma
+    try:
+        return csv.Sniffer().sniff(text[:4096], delimiters=',;\t|').delimiter
+    except csv.Error:
+        return ','
+
+
+def read_bulk_csv(file):
+    """CSV (tracking_id, bukti) dari admin -> frame BULK_COLUMNS.
+
+    Pemisah (koma, titik koma, tab) dideteksi dari isi file. Baris judul
+    boleh ada atau tidak (dikenali dari namanya); tanpa judul, kolom
+    pertama = Tracking ID dan kolom kedua = bukti.
+    """
+    data = file.read() if hasattr(file, 'read') else Path(file).read_bytes()
+    text = data.decode('utf-8-sig') if isinstance(data, bytes) else data
+    raw = pd.read_csv(io.StringIO(text), sep=_sniff_sep(text), dtype=str,
+                      keep_default_na=False, header=None)
+    if raw.empty: return pd.DataFrame(columns=BULK_COLUMNS)
+    if _is_header(raw.iloc[0]):
+        raw = raw.iloc[1:].set_axis([str(c).strip() for c in raw.iloc[0]], axis=1)
+    else:
+        raw.columns = [str(c) for c in raw.columns]
+    col_id = next((c for c in raw.columns if 'tracking' in c.lower() or c.strip().lower() == 'id'), raw.columns[0])
+    col_bukti = next((c for c in raw.columns if 'bukti' in c.lower() or 'akhir' in c.lower()),
+                     raw.columns[1] if len(raw.columns) > 1 else None)
+    bukti = raw[col_bukti] if col_bukti is not None else ''
+    return pd.DataFrame({'Tracking ID': raw[col_id], 'Bukti': bukti}).reset_index(drop=True)
+
+
+def validate_bulk(rows, id_index, open_ids):
+    """Periksa semua baris sekaligus; tambah kolom Valid & Keterangan.
+
+    Baris gagal jika ID tidak ada, laporan sudah selesai, atau bukti kosong.
+    Di antara baris yang lolos, ID yang muncul lagi di bawahnya ditandai
+    ganda (baris valid terakhir yang dipakai).
+    """
+    ids = rows['Tracking ID'].astype(str).str.strip().str.replace(r'\.0$', '', regex=True)
+    bukti = rows['Bukti'].fillna('').astype(str).str.strip()
+    unknown = ~ids.isin(id_index)
+    closed = ~unknown & ~ids.isin(open_ids)
+    empty = bukti == ''
+    ok = ~(unknown | closed | empty)
+    duplicate = ok & ids.where(ok).duplicated(keep='last')
+    keterangan = np.select(
+        [unknown, closed, empty, duplicate],
+        ["ID tidak ditemukan", "Laporan sudah selesai", "Bukti penyelesaian kosong", "ID ganda (dipakai baris terakhir)"],
+        "OK"
+    )
+    return pd.DataFrame({'Tracking ID': ids, 'Bukti': bukti, 'Valid': keterangan == "OK", 'Keterangan': keterangan})
+
+
+def _apply_to_source(df_orig, updates):
+    col_id = next((c for c in df_orig.columns if 'tracking' in c.lower()), 'tracking_id')
+    col_stat = next((c for c in df_orig.columns if 'status' in c.lower() and 'final' in c.lower()), 'status_final')
+    col_bukti = next((c for c in df_orig.columns if 'akhir' in c.lower()), 'isi_laporan_akhir')
+
+    df_orig[col_id] = df_orig[col_id].astype(str).str.replace(r'\.0$', '', regex=True)
+    mask = df_orig[col_id].isin(updates.index)
+    ids = df_orig.loc[mask, col_id]
+    df_orig.loc[mask, col_stat] = ids.map(updates['status']).to_numpy()
+    df_orig.loc[mask, col_bukti] = ids.map(updates['bukti']).to_numpy()
+    return df_orig
+
+
+def _write_source(df_orig, path):
+    path = Path(path)
+    tmp = path.with_name(path.stem + '.tmp' + path.suffix)
+    if path.suffix == '.xlsx':
+        df_orig.to_excel(tmp, index=False)
+    else:
+        df_orig.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def export(source_path, out_path, db_path=DB_PATH):
+    """Tulis salinan file sumber beserta semua perubahan ke out_path (jurnal tidak dihapus)."""
+    updates = pending_updates(db_path)
+    _write_source(_apply_to_source(pipeline.read_source(source_path), updates), out_path)
+    return len(updates)
+
+
+def compact(source_path, db_path=DB_PATH):
+    """Tulis semua perubahan ke file sumber lalu kosongkan jurnal.
+
+    Jika sumbernya folder export, hanya laporan yang berubah yang ditulis
+    sebagai file export baru (paling baru = menang saat digabung).
+    """
+    updates = pending_updates(db_path)
+    if updates.empty: return 0
+    df_orig = _apply_to_source(pipeline.read_source(source_path), updates)
+    if os.path.isdir(source_path):
+        _write_source(df_orig[df_orig['tracking_id'].isin(updates.index)], ingest.export_path(source_path))
+    else:
+        _write_source(df_orig, source_path)
+    with connect(db_path) as conn:
+        # Hanya hapus baris yang memang ikut ditulis; update baru tetap di jurnal.
+        conn.executemany(
+            "DELETE FROM status_updates WHERE tracking_id = ? AND updated_at = ?",
+            list(zip(updates.index, updates['updated_at']))
+        )
+    return len(updates)
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ('compact', 'export'):
+        print('Pemakaian: python status_store.py compact [file_sumber] | export <file_tujuan> [file_sumber]', file=sys.stderr)
+        sys.exit(1)
+
+    if sys.argv[1] == 'compact':
+        source = sys.argv[2] if len(sys.argv) > 2 else pipeline.get_file_path()
+        if not source:
+            print('File sumber tidak ditemukan.', file=sys.stderr)
+            sys.exit(1)
+        from write_queue import file_lock
+        # Kunci yang sama dengan penulis di app.py: tidak bentrok dengan admin yang sedang menyimpan
+        with file_lock(source):
+            n = compact(source)
+        print(f'{n} perubahan ditulis ke {source}')
+    else:
+        if len(sys.argv) < 3:
+            print('File tujuan wajib diisi.', file=sys.stderr)
+            sys.exit(1)
+        source = sys.argv[3] if len(sys.argv) > 3 else pipeline.get_file_path()
+        if not source:
+            print('File sumber tidak ditemukan.', file=sys.stderr)
+            sys.exit(1)
+        print(f'{export(source, sys.argv[2])} perubahan diekspor ke {sys.argv[2]}')
+
+
+if __name__ == '__main__':
+    main()
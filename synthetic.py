@@ -0,0 +1,139 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from gazetteer import load_gazetteer
+
+# Generator dataset sintetis berbentuk export SP4N LAPOR (kolom mentah sama
+# dengan sp4n-lapor_2021-2024.xlsx) untuk mengukur skala pipeline. Sebaran
+# kategori, dinas, status dan teks laporan diambil dari workbook contoh bila
+# ada; kecamatan diberi variasi ejaan supaya gazetteer ikut teruji.
+SAMPLE_FILE = Path(__file__).resolve().parent / 'sp4n-lapor_2021-2024.xlsx'
+
+SIZES = {
+    '10k': 10_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+    '5m': 5_000_000,
+}
+
+START = pd.Timestamp('2021-01-01')
+END = pd.Timestamp('2024-12-31')
+
+# Dipakai jika workbook contoh tidak tersedia
+DEFAULT_PROFILE = {
+    'kategori': {'Jalan Berlubang': 12, 'Tidak Diketahui': 10, 'Topik Lainnya': 8, 'Banjir': 6,
+                 'Pengaduan Sampah': 5, 'Bantuan Sosial': 5, 'Administrasi Kependudukan': 4},
+    'dinas_tujuan': {'Dinas Pekerjaan Umum Dan Tata Ruang Kab. Bandung': 15, 'Tidak Diketahui': 10,
+                     'Dinas Sosial Kabupaten Bandung': 7, 'Dinas Lingkungan Hidup Kab. Bandung': 5,
+                     'Dinas Kependudukan Dan Pencatatan Sipil Kab. Bandung': 4},
+    'status': {'Ditutup Oleh Sistem': 70, 'Ditutup Oleh Admin': 12, 'Diarsipkan Oleh Admin': 5,
+               'Menunggu Kelengkapan Informasi': 4, 'Diarsipkan Oleh Pelapor': 2},
+    'status_final': {'Selesai': 86, 'Diproses': 7, 'Menunggu': 4, 'Belum Terverifikasi': 3},
+    'sumber_laporan': {'Website': 55, 'Android': 22, 'iOS': 5},
+    'kota_kabupaten': {'Bandung': 60, 'Kota Bandung': 40},
+    'isi_laporan_awal': [
+        'Jalan di depan rumah kami rusak parah dan berlubang, sudah lama tidak diperbaiki.',
+        'Mohon informasi pencairan bantuan sosial, proses sangat lambat.',
+        'Banjir kembali terjadi setelah hujan deras, warga kecewa karena saluran tersumbat sampah.',
+        'Tumpukan sampah di pinggir jalan menimbulkan bau tidak sedap.',
+        'Terjadi kecelakaan di tikungan karena lampu jalan mati.',
+        'Pengurusan KTP elektronik susah dan ribet, antrian lama.',
+    ],
+}
+
+UNKNOWN_KECAMATAN = ['Tidak Diketahui', '-', None]
+PROFILE_COLUMNS = ['kategori', 'dinas_tujuan', 'status', 'status_final', 'sumber_laporan', 'kota_kabupaten']
+
+
+def load_profile(sample_file=SAMPLE_FILE):
+    """Frekuensi nilai per kolom & kumpulan teks dari workbook contoh (atau DEFAULT_PROFILE)."""
+    if not Path(sample_file).exists(): return DEFAULT_PROFILE
+    df = pd.read_excel(sample_file, engine='openpyxl')
+    profile = {c: df[c].dropna().astype(str).value_counts().to_dict() for c in PROFILE_COLUMNS if c in df.columns}
+    profile['isi_laporan_awal'] = df['isi_laporan_awal'].dropna().astype(str).tolist()
+    # Porsi kecamatan kosong mengikuti contoh
+    profile['kecamatan_unknown'] = float(df['kecamatan_final'].isin(['Tidak Diketahui', '-']).mean())
+    return {**DEFAULT_PROFILE, **profile}
+
+
+def _draw(rng, freq, n):
+    values = np.array(list(freq), dtype=object)
+    p = np.array(list(freq.values()), dtype=float)
+    return values[rng.choice(len(values), size=n, p=p / p.sum())]
+
+
+def _kecamatan(rng, n, unknown_share):
+    names = load_gazetteer().entries['nama'].astype(str).tolist() or ['Baleendah']
+    variants = np.array(
+        [v for name in names for v in (name, name.upper(), name.lower(), f'Kec. {name}', name[:-1])],
+        dtype=object
+    )
+    out = variants[rng.integers(0, len(variants), n)]
+    unknown = rng.random(n) < unknown_share
+    out[unknown] = np.array(UNKNOWN_KECAMATAN, dtype=object)[rng.integers(0, len(UNKNOWN_KECAMATAN), unknown.sum())]
+    return out
+
+
+def generate(n, seed=0, profile=None):
+    """DataFrame n baris dengan kolom mentah seperti export SP4N LAPOR."""
+    if profile is None: profile = load_profile()
+    rng = np.random.default_rng(seed)
+
+    span = int((END - START) / pd.Timedelta(seconds=1))
+    masuk = START + pd.to_timedelta(np.sort(rng.integers(0, span, n)), unit='s')
+
+    texts = np.array(profile['isi_laporan_awal'], dtype=object)
+    isi = pd.Series(texts[rng.integers(0, len(texts), n)])
+    # Sedikit variasi agar teks tidak identik satu sama lain
+    rt = pd.Series(rng.integers(1, 20, n)).astype(str)
+    isi = isi + ' RT ' + rt + '.'
+
+    status_final = _draw(rng, profile['status_final'], n)
+    selesai = status_final == 'Selesai'
+    akhir = np.where(selesai, 'Laporan telah ditindaklanjuti oleh dinas terkait.', '-')
+
+    return pd.DataFrame({
+        'tracking_id': np.arange(9_000_000, 9_000_000 + n),
+        'tanggal_masuk': masuk.normalize(),
+        'waktu_masuk': masuk.strftime('%H:%M:%S'),
+        'kategori': _draw(rng, profile['kategori'], n),
+        'isi_laporan_awal': isi.to_numpy(dtype=object),
+        'isi_laporan_akhir': akhir,
+        'sumber_laporan': _draw(rng, profile['sumber_laporan'], n),
+        'instansi_induk': 'Pemerintah Kabupaten Bandung',
+        'dinas_tujuan': _draw(rng, profile['dinas_tujuan'], n),
+        'status': _draw(rng, profile['status'], n),
+        'provinsi': 'Jawa Barat',
+        'kota_kabupaten': _draw(rng, profile['kota_kabupaten'], n),
+        'status_final': status_final,
+        'kecamatan_final': _kecamatan(rng, n, profile.get('kecamatan_unknown', 0.4)),
+    })
+
+
+def parse_size(text):
+    text = str(text).lower()
+    return SIZES[text] if text in SIZES else int(text.replace('_', ''))
+
+
+def write(df, path):
+    path = Path(path)
+    if path.suffix == '.parquet': df.to_parquet(path, index=False)
+    elif path.suffix == '.xlsx': df.to_excel(path, index=False)
+    else: df.to_csv(path, index=False)
+
+
+def main():
+    if len(sys.argv) < 3:
+        print(f"Pemakaian: python synthetic.py <jumlah|{'|'.join(SIZES)}> <file_tujuan.csv|.parquet|.xlsx> [seed]", file=sys.stderr)
+        sys.exit(1)
+    n = parse_size(sys.argv[1])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    write(generate(n, seed), sys.argv[2])
+    print(f'{n} baris sintetis ditulis ke {sys.argv[2]}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+import threading
+
+import numpy as np
+
+from status_store import OVERLAY_COLUMNS
+
+# Penjelajah "Data Lengkap" yang dipaginasi di server. Urutan setiap kolom
+# dihitung sekali (rank per baris) dari frame per-rerun saat kolom itu pertama
+# kali dipakai; mengurutkan hasil filter cukup mengurutkan rank baris yang
+# terpilih, lalu hanya satu halaman dengan kolom yang dipilih yang dikirim ke
+# browser. Index tidak menyimpan frame; rank kolom yang diubah jurnal status
+# dibuang lewat sync() saat jurnal berubah.
+DEFAULT_COLUMNS = ['Tracking ID', 'Tanggal_Parsed', 'Kategori_Clean', 'Kecamatan_Clean', 'Status_Clean', 'Sisa_Hari']
+PAGE_SIZES = [25, 50, 100, 250]
+
+# Kolom yang berubah tiap rerun diurutkan lewat kolom stabil yang urutannya sama
+# (Sisa_Hari = Target_Selesai - hari ini).
+SORT_KEYS = {'Sisa_Hari': 'Target_Selesai'}
+
+
+class SortIndex:
+    def __init__(self, n_rows, columns):
+        self.n_rows = n_rows
+        # Hanya kolom frame yang di-cache; kolom SLA per-rerun tidak diberi rank
+        self.columns = frozenset(columns)
+        self._ranks = {}
+        self._journal = None
+        self._lock = threading.Lock()
+
+    def sortable(self, columns):
+        return [c for c in columns if SORT_KEYS.get(c, c) in self.columns]
+
+    def sync(self, updates):
+        """Buang rank kolom overlay jika jurnal status berubah sejak sync terakhir."""
+        journal = (len(updates), updates['updated_at'].max() if len(updates) else None)
+        with self._lock:
+            if journal == self._journal: return
+            self._journal = journal
+            for col in OVERLAY_COLUMNS: self._ranks.pop(col, None)
+
+    def rank(self, df, col):
+        """Rank 0..n-1 tiap baris menurut kolom `col`; nilai kosong selalu di akhir."""
+        col = SORT_KEYS.get(col, col)
+        with self._lock:
+            if col not in self._ranks:
+                values = df[col].reset_index(drop=True)
+                order = values.sort_values(kind='stable', na_position='last').index.to_numpy()
+                rank = np.empty(self.n_rows, dtype=np.int64)
+                rank[order] = np.arange(self.n_rows)
+                self._ranks[col] = (rank, int(values.notna().sum()))
+            return self._ranks[col]
+
+    def sort(self, df, rows, col, ascending=True):
+        """Posisi baris `rows` (None = semua) terurut menurut `col` pada frame `df`."""
+        if rows is None: rows = np.arange(self.n_rows)
+        rank, n_valid = self.rank(df, col)
+        key = rank[rows]
+        if not ascending:
+            # Balik urutan nilai yang terisi, nilai kosong tetap di akhir
+            key = np.where(key < n_valid, n_valid - 1 - key, key)
+        return rows[np.argsort(key, kind='stable')]
+
+
+def page_count(n_rows, page_size):
+    return max(1, -(-n_rows // page_size))
+
+
+def page(df, rows, columns, number, page_size):
+    """Satu halaman (mulai dari 1) berisi kolom `columns` saja."""
+    start = (number - 1) * page_size
+    positions = rows[start:start + page_size]
+    cols = [df.columns.get_loc(c) for c in columns if c in df.columns]
+    return df.iloc[positions, cols]
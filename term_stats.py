@@ -0,0 +1,75 @@
+import io
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+import search
+
+# Statistik kata untuk word cloud & panel kata teratas. Isi laporan
+# di-tokenize sekali saat data dimuat (tokenizer yang sama dengan search.py)
+# lalu dijumlahkan per partisi (Tahun, Bulan, Kecamatan, Kategori). Hitungan
+# untuk kombinasi filter apa pun = jumlah baris partisi yang cocok, tanpa
+# membaca ulang teks laporan.
+PARTITION = ['Tahun', 'Bulan', 'Kecamatan_Clean', 'Kategori_Clean']
+TEXT_COLUMN = 'Isi Laporan Awal'
+
+# Kata yang sering muncul tetapi tidak menjelaskan masalah (sapaan, wilayah, alamat)
+EXTRA_STOPWORDS = frozenset("""
+bandung kabupaten kecamatan kelurahan desa kampung rt rw no nomor kami warga terima kasih
+tolong bapak pemerintah pemkab dinas laporan lapor melaporkan ingin tidak sudah ya
+""".split())
+
+WIDTH = 800
+HEIGHT = 400
+
+
+class TermStats:
+    def __init__(self, df):
+        counts, vocab = search.term_counts(df[TEXT_COLUMN].to_numpy(dtype=object))
+        self.terms = np.empty(len(vocab), dtype=object)
+        for term, col in vocab.items(): self.terms[col] = term
+
+        # Baris -> partisi, lalu (partisi x term) = indikator @ (laporan x term)
+        grouped = df[PARTITION].groupby(PARTITION, observed=True, dropna=False, sort=False)
+        part = grouped.ngroup().to_numpy()
+        self.keys = grouped.size().reset_index(name='Laporan')
+        n_parts = len(self.keys)
+        indicator = sparse.csr_matrix((np.ones(len(part), dtype=np.float32), (part, np.arange(len(part)))),
+                                      shape=(n_parts, len(part)))
+        self.matrix = (indicator @ counts).tocsr()
+
+        informative = np.array([not (t in EXTRA_STOPWORDS or t.isdigit()) for t in self.terms], dtype=bool)
+        self._informative = informative
+
+    def select(self, **filters):
+        """Indeks partisi yang cocok; filter None/list kosong diabaikan."""
+        mask = np.ones(len(self.keys), dtype=bool)
+        for col, values in filters.items():
+            if values is None or (isinstance(values, (list, tuple, set)) and not values): continue
+            values = list(values) if isinstance(values, (list, tuple, set)) else [values]
+            mask &= self.keys[col].isin(values).to_numpy()
+        return np.flatnonzero(mask)
+
+    def counts(self, **filters):
+        """Hitungan tiap term (panjang = jumlah term) untuk gabungan partisi terpilih."""
+        parts = self.select(**filters)
+        return np.asarray(self.matrix[parts].sum(axis=0)).ravel()
+
+    def top_terms(self, n=20, **filters):
+        counts = np.where(self._informative, self.counts(**filters), 0)
+        top = np.argsort(-counts, kind='stable')[:n]
+        top = top[counts[top] > 0]
+        return pd.DataFrame({'Kata': self.terms[top], 'Jumlah': counts[top].astype(int)})
+
+
+def render_wordcloud(frequencies, width=WIDTH, height=HEIGHT):
+    """PNG (bytes) word cloud dari {kata: jumlah}; None jika kosong."""
+    from wordcloud import WordCloud
+
+    if not frequencies: return None
+    image = WordCloud(width=width, height=height, background_color='white', colormap='viridis',
+                      random_state=0).generate_from_frequencies(frequencies).to_image()
+    buf = io.BytesIO()
+    image.save(buf, format='PNG')
+    return buf.getvalue()
@@ -0,0 +1,130 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+
+import status_store
+
+# Satu penulis untuk semua perubahan dari Admin Center di proses ini.
+# Form admin hanya memasukkan permintaan ke antrian dan menunggu Future-nya;
+# thread penulis mengumpulkan semua permintaan yang masuk dalam FLUSH_DETIK
+# lalu menuliskannya ke jurnal status dalam satu transaksi, sambil memegang
+# kunci eksklusif atas file data (juga dipakai compact() dan CLI), sehingga
+# tidak ada perubahan yang tertimpa walau beberapa admin menyimpan bersamaan.
+FLUSH_DETIK = 0.2
+LOCK_TIMEOUT = 30  # detik
+LOCK_NAME = '.lapor.lock'
+
+try:
+    import fcntl
+
+    def _try_lock(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+except ImportError:  # Windows
+    import msvcrt
+
+    def _try_lock(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+
+    def _unlock(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def lock_path(source):
+    source = Path(source)
+    return source / LOCK_NAME if source.is_dir() else source.with_name(source.name + '.lock')
+
+
+@contextmanager
+def file_lock(source, timeout=LOCK_TIMEOUT):
+    """Kunci eksklusif antar proses atas file/folder data."""
+    with open(lock_path(source), 'a+b') as f:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                _try_lock(f)
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"File data sedang dikunci proses lain: {source}")
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            _unlock(f)
+
+
+class WriteQueue:
+    def __init__(self, source, db_path=status_store.DB_PATH, flush_interval=FLUSH_DETIK):
+        self.source = source
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='lapor-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, tracking_id, bukti_text, status='Selesai'):
+        """Future yang berisi (sukses, pesan) setelah perubahan tersimpan."""
+        return self.submit_many([(tracking_id, status, bukti_text)])
+
+    def submit_many(self, rows):
+        """Banyak (tracking_id, status, bukti) sekaligus; tersimpan semua atau tidak sama sekali."""
+        future = Future()
+        self._queue.put(('update', [(str(tid), status, bukti) for tid, status, bukti in rows], future))
+        return future
+
+    def compact(self):
+        """Future berisi jumlah perubahan yang ditulis ke file sumber."""
+        future = Future()
+        self._queue.put(('compact', None, future))
+        return future
+
+    def pending(self):
+        return self._queue.qsize()
+
+    # --- THREAD PENULIS ---
+    def _drain(self):
+        """Permintaan pertama (menunggu) + semua yang masuk selama flush_interval."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0: break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._drain()
+            updates = [(args, fut) for kind, args, fut in batch if kind == 'update' and fut.set_running_or_notify_cancel()]
+            compacts = [fut for kind, _, fut in batch if kind == 'compact' and fut.set_running_or_notify_cancel()]
+            try:
+                with file_lock(self.source):
+                    if updates: self._flush(updates)
+                    if compacts:
+                        n = status_store.compact(self.source, self.db_path)
+                        for fut in compacts: fut.set_result(n)
+            except Exception as e:
+                for _, fut in updates:
+                    if not fut.done(): fut.set_result((False, str(e)))
+                for fut in compacts:
+                    if not fut.done(): fut.set_exception(e)
+
+    def _flush(self, updates):
+        # Permintaan untuk ID yang sama: yang terakhir menang, semua mendapat hasil
+        latest = {}
+        for rows, _ in updates:
+            for tracking_id, status, bukti in rows: latest[tracking_id] = (tracking_id, status, bukti)
+        status_store.record_updates(list(latest.values()), self.db_path)
+        for rows, fut in updates:
+            fut.set_result((True, "Data berhasil disimpan!" if len(rows) == 1 else f"{len(rows)} laporan berhasil disimpan!"))